@@ -0,0 +1,68 @@
+"""
+Import-time report for the app's cold start.
+
+Runs `python -X importtime` in a fresh interpreter for the modules the app
+loads before first paint (the module-level imports of app.py), then for the
+Excel engines that are only pulled in by an upload or export, and prints
+where the time goes.
+
+    python profile_startup.py [--top 15]
+"""
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+APP = Path(__file__).with_name("app.py")
+# Only imported by pandas when a workbook is read or written.
+DEFERRED = ["openpyxl", "xlsxwriter"]
+
+
+def app_imports(path=APP) -> list:
+    """Modules app.py imports at module level, i.e. on every new session before the uploader is shown."""
+    modules = []
+    for node in ast.parse(Path(path).read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_times(modules):
+    """Return [(cumulative_us, self_us, module)] for one fresh interpreter importing `modules`."""
+    code = "; ".join(f"import {m}" for m in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def report(title, modules, top):
+    rows = import_times(modules)
+    # Interpreter startup (site, encodings, ...) is reported too; only total what we asked for.
+    total = sum(r[0] for r in rows if r[2].strip() in modules and not r[2].startswith("  "))
+    print(f"\n{title}: {' '.join(modules)}  ({total / 1000:.0f} ms)")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    report("Cold path", app_imports(), args.top)
+    for module in DEFERRED:
+        report("Deferred", [module], 5)
+
+
+if __name__ == "__main__":
+    main()
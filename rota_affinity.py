@@ -0,0 +1,74 @@
+"""
+Hierarchical analyst affinity index: team -> competition -> tier.
+
+Historical Score only knows analyst x team. Joined with the competitions
+those teams play in (the uploaded fixtures, with their QIndex tier), the
+same history rolls up into competition and tier affinity, so an analyst who
+has covered many teams of a competition ranks ahead for a promoted side or
+a cup opponent they have never seen.
+
+Each level is one frame of (Key, Analyst, match_count, average_score).
+DayMatrix reads it as analyst x fixture matrices; candidates are ranked per
+slot by the selection policy, which tries the levels in order and then falls
+back on workload and experience (rota_engine.SELECTION_POLICY).
+
+    affinity = reference.affinity_index(plan)
+    matchCount, averageScore = affinity.matrices("competition", analysts, fixtures["Competition"])
+"""
+import numpy as np
+import pandas as pd
+
+from rota_cache import nbytes
+from rota_io import frame_fingerprint
+
+SIDES = ("Home", "Away")
+# level -> fixture column holding its key ("team" is the slot's own side)
+AFFINITY_LEVELS = {"team": None, "competition": "Competition", "tier": "Tier"}
+
+
+def team_competitions(fixtures: pd.DataFrame) -> pd.DataFrame:
+    """Distinct (Team, Competition, Tier) played in the QIndex-joined fixtures."""
+    columns = ["Team", "Competition", "Tier"]
+    pairs = pd.concat([fixtures[[f"{side} Team", "Competition", "Tier"]].set_axis(columns, axis=1)
+                       for side in SIDES], ignore_index=True)
+    return pairs.dropna().drop_duplicates().sort_values(columns).reset_index(drop=True)
+
+
+def rollup(team_history: pd.DataFrame, pairs: pd.DataFrame, column) -> pd.DataFrame:
+    """Team history summed to (Analyst, column): total matches and their average score."""
+    joined = team_history.merge(pairs[["Team", column]].drop_duplicates(), on="Team")
+    joined["total_score"] = joined["match_count"] * joined["average_score"]
+    level = joined.groupby(["Analyst", column], as_index=False).agg(match_count=("match_count", "sum"),
+                                                                   total_score=("total_score", "sum"))
+    level["average_score"] = (level["total_score"] / level["match_count"]).round(2)
+    return level.rename(columns={column: "Key"}).drop(columns="total_score")
+
+
+class AffinityIndex:
+
+    def __init__(self, team_history, fixtures):
+        pairs = team_competitions(fixtures)
+        self.key = frame_fingerprint(pairs)
+        self.levels = {}
+        for level, column in AFFINITY_LEVELS.items():
+            frame = (team_history.rename(columns={"Team": "Key"}) if column is None
+                     else rollup(team_history, pairs, column))
+            self.levels[level] = frame[["Key", "Analyst", "match_count", "average_score"]].reset_index(drop=True)
+
+    def __sizeof__(self):
+        # Counted by rota_cache.nbytes when the index is cached: the frames, not just the object.
+        return object.__sizeof__(self) + nbytes(self.levels)
+
+    def matrices(self, level, analysts, keys):
+        """(analyst x fixture) match_count and average_score at `level` for each fixture's key."""
+        frame = self.levels[level]
+        codes, uniques = pd.factorize(pd.Series(keys, dtype=object))
+        rows = pd.Index(analysts).get_indexer(frame["Analyst"])
+        cols = pd.Index(uniques).get_indexer(frame["Key"])
+        known = (rows >= 0) & (cols >= 0)
+        # One column per distinct key, plus a last empty one for fixtures without a key.
+        count = np.zeros((len(analysts), len(uniques) + 1))
+        score = np.full((len(analysts), len(uniques) + 1), np.nan)
+        count[rows[known], cols[known]] = frame["match_count"].to_numpy()[known]
+        score[rows[known], cols[known]] = frame["average_score"].to_numpy()[known]
+        return count[:, codes], score[:, codes]
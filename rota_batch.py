@@ -0,0 +1,155 @@
+"""
+Batch runs: one input workbook per roster, scheduled in parallel.
+
+Each workbook is run with the app's default day settings (match days close
+at 06:00, the first opens at 12:00, weekends peak) in its own worker process, and its full export
+is written next to it as <workbook>_assignment_export.xlsx. Reference inputs
+given on the command line (e.g. one QIndex for every tier) are read once and
+handed to each worker when it starts, instead of being re-read per roster.
+
+    python rota_batch.py rosters/                      # every .xlsx in the folder
+    python rota_batch.py manifest.csv --qindex qindex.csv --workers 4
+
+A manifest is a CSV with a `workbook` column (paths relative to the
+manifest). A coverage/runtime summary per roster is written to
+batch_summary.csv in the folder / next to the manifest.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from rota_cache import SHARED_CACHE
+from rota_calendar import RotaCalendar
+from rota_engine import FixturePlan, ReferenceData, run_schedule
+from rota_export import RunExports, to_csv_bytes
+from rota_io import (INPUT_SHEETS, OPTIONAL_SHEETS, REFERENCE_SHEETS, frame_fingerprint, input_format, load_workbook,
+                     read_input)
+
+EXPORT_SUFFIX = "_assignment_export.xlsx"
+SUMMARY_FILE = "batch_summary.csv"
+SUMMARY_COLUMNS = ["Roster", "Days", "Fixtures", "Slots", "Filled", "Coverage %", "Analysts Used",
+                   "Missing Competitions", "Runtime (s)", "Status", "Input", "Export"]
+
+# Shared reference inputs, set once per worker process by _init_worker().
+_SHARED = {}
+
+
+# =========================
+# Inputs
+# =========================
+def find_workbooks(source) -> list:
+    """Workbook paths from a folder (every .xlsx, exports excluded) or a manifest CSV."""
+    source = Path(source)
+    if source.is_dir():
+        return sorted(p for p in source.glob("*.xlsx")
+                      if not p.name.endswith(EXPORT_SUFFIX) and not p.name.startswith("~$"))
+    manifest = pd.read_csv(source)
+    if "workbook" not in manifest.columns:
+        raise ValueError(f"{source}: manifest needs a 'workbook' column")
+    return [(source.parent / p).resolve() for p in manifest["workbook"].dropna().astype(str)]
+
+
+def load_shared(paths: dict) -> dict:
+    """{sheet: path} -> {sheet: validated frame}, read once for the whole batch."""
+    return {sheet: read_input(path, sheet, fmt=input_format(path)) for sheet, path in paths.items() if path}
+
+
+# =========================
+# Worker
+# =========================
+def _init_worker(shared):
+    _SHARED.update(shared)
+
+
+def run_roster(workbook) -> dict:
+    """Schedule one roster workbook, write its export and return its summary row."""
+    started = time.perf_counter()
+    workbook = Path(workbook)
+    row = {"Roster": workbook.stem, "Input": str(workbook)}
+    try:
+        sheets = [sheet for sheet in INPUT_SHEETS + OPTIONAL_SHEETS if sheet not in _SHARED]
+        frames = {**dict(zip(sheets, load_workbook(workbook, sheets=sheets))), **_SHARED}
+
+        fixtures = frames["Fixtures"]
+        # Rosters a worker runs that share a Historical Score reuse its summary / team index.
+        keys = {sheet: frame_fingerprint(frames[sheet]) for sheet in REFERENCE_SHEETS}
+        reference = ReferenceData(*(frames[sheet] for sheet in REFERENCE_SHEETS),
+                                  df_overrides=frames[OPTIONAL_SHEETS[0]], cache=SHARED_CACHE, keys=keys)
+        plan = FixturePlan(fixtures, reference.df_qindex)
+        if plan.missing_competitions:
+            # As in the app: fixtures without QIndex would be left out of the export, not run short.
+            row.update({"Fixtures": len(fixtures), "Missing Competitions": len(plan.missing_competitions)})
+            raise ValueError(f"Competition {', '.join(plan.missing_competitions)} is not in QIndex")
+        calendar = RotaCalendar.from_kick_offs(fixtures["Kick Off"])
+        assignments, shifts, nonUsed = run_schedule(plan, reference, calendar)
+
+        export = workbook.with_name(workbook.stem + EXPORT_SUFFIX)
+        export.write_bytes(RunExports(assignments, shifts, nonUsed, reference).build("workbook"))
+
+        # Every uploaded fixture counts, including any outside the day windows, which get no row.
+        slots = 2 * len(fixtures)
+        filled = int(assignments[["Home Analyst", "Away Analyst"]].notna().sum().sum()) if slots else 0
+        row.update({
+            "Export": str(export),
+            "Days": len(calendar),
+            "Fixtures": len(fixtures),
+            "Slots": slots,
+            "Filled": filled,
+            "Coverage %": round(100 * filled / slots, 1) if slots else None,
+            "Analysts Used": shifts["Analyst"].nunique(),
+            "Missing Competitions": 0,
+            "Status": "ok",
+        })
+    except Exception as e:
+        # One bad workbook should not sink the rest of the batch.
+        row["Status"] = f"{type(e).__name__}: {e}"
+    row["Runtime (s)"] = round(time.perf_counter() - started, 2)
+    return row
+
+
+# =========================
+# Batch
+# =========================
+def run_batch(workbooks, shared=None, workers=None) -> pd.DataFrame:
+    """Run every workbook in a process pool; returns the summary in input order."""
+    shared = shared or {}
+    workers = min(workers or os.cpu_count() or 1, max(len(workbooks), 1))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,)) as pool:
+        rows = list(pool.map(run_roster, workbooks))
+    return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", help="folder of roster workbooks, or a manifest CSV with a 'workbook' column")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--score", help="shared Historical Score (.csv/.parquet/.xlsx) for every roster")
+    parser.add_argument("--availability", help="shared Analyst Availability for every roster")
+    parser.add_argument("--qindex", help="shared QIndex for every roster")
+    parser.add_argument("--summary", help=f"summary CSV path (default: {SUMMARY_FILE} beside the source)")
+    args = parser.parse_args()
+
+    workbooks = find_workbooks(args.source)
+    if not workbooks:
+        parser.error(f"no workbooks found in {args.source}")
+    shared = load_shared(dict(zip(REFERENCE_SHEETS, (args.score, args.availability, args.qindex))))
+
+    started = time.perf_counter()
+    summary = run_batch(workbooks, shared=shared, workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    source = Path(args.source)
+    summary_path = Path(args.summary) if args.summary else (source if source.is_dir() else source.parent) / SUMMARY_FILE
+    summary_path.write_bytes(to_csv_bytes(summary))
+
+    print(summary.drop(columns=["Input", "Export"], errors="ignore").to_string(index=False))
+    print(f"\n{len(workbooks)} roster(s) in {elapsed:.1f}s "
+          f"(sum of roster runtimes {summary['Runtime (s)'].sum():.1f}s); summary: {summary_path}")
+
+
+if __name__ == "__main__":
+    main()
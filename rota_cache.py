@@ -0,0 +1,122 @@
+"""
+Process-wide cache of reference structures.
+
+Entries are keyed by (kind, content key of the sheet they come from), so
+two uploads that share a Historical Score or QIndex sheet share one
+resident score summary / team index / QIndex frame, whichever workbook
+they came in and whichever session or request asked first. Eviction is
+least-recently-used, bounded by the estimated memory size of the entries.
+
+    SHARED_CACHE.get_or_build("score summary", key, build)
+    SHARED_CACHE.stats()
+
+The bound is ROTA_CACHE_MB (default 512) megabytes.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def nbytes(value) -> int:
+    """Estimated memory held by a cached value."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(nbytes(k) + nbytes(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class SharedCache:
+    """
+    Thread-safe LRU bounded by memory size, with hit/miss counts per kind.
+
+    Each key is built at most once at a time: a second caller for a key
+    that is being built waits for it instead of building its own copy.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (kind, key) -> (value, size)
+        self._building = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.evictions = 0
+        self.counts = {}  # kind -> [hits, misses]
+
+    def _count(self, kind, hit):
+        self.counts.setdefault(kind, [0, 0])[0 if hit else 1] += 1
+
+    def _lookup(self, entry):
+        if entry in self._entries:
+            self._entries.move_to_end(entry)
+            self._count(entry[0], True)
+            return True, self._entries[entry][0]
+        return False, None
+
+    def get_or_build(self, kind, key, build):
+        entry = (kind, key)
+        with self._lock:
+            found, value = self._lookup(entry)
+            if found:
+                return value
+            keyLock = self._building.setdefault(entry, threading.Lock())
+
+        with keyLock:
+            with self._lock:
+                found, value = self._lookup(entry)
+                if found:
+                    return value
+            value = build()
+            with self._lock:
+                self._count(kind, False)
+                self._store(entry, value)
+                self._building.pop(entry, None)
+        return value
+
+    def intern(self, kind, key, value):
+        """The resident copy of `value` for this key, storing it if there is none."""
+        return self.get_or_build(kind, key, lambda: value)
+
+    def _store(self, entry, value):
+        size = nbytes(value)
+        if size > self.max_bytes:
+            return
+        self._entries[entry] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = sum(c[0] for c in self.counts.values())
+            misses = sum(c[1] for c in self.counts.values())
+            return {
+                "entries": len(self._entries),
+                "mb": round(self.bytes / 2**20, 2),
+                "max_mb": round(self.max_bytes / 2**20, 2),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+                "evictions": self.evictions,
+                "kinds": {kind: {"hits": c[0], "misses": c[1]} for kind, c in self.counts.items()},
+            }
+
+
+SHARED_CACHE = SharedCache(int(float(os.environ.get("ROTA_CACHE_MB", 512)) * 2**20))
@@ -0,0 +1,151 @@
+"""
+Calendar of processing days for one rota.
+
+Day i is `first + i` days. Every per-day setting (match day window, peak
+flag, match/shift lengths) is a NumPy array indexed by day, so lookups and
+filters are integer/datetime64 comparisons instead of formatted date strings.
+Display labels are built once, with portable formatting.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from rota_io import WEEKDAYS
+
+DAY = np.timedelta64(1, "D")
+
+PEAK_MAXIMUM_ASSIGNMENTS = 3
+NON_PEAK_MAXIMUM_ASSIGNMENTS = 2
+
+
+class RotaCalendar:
+
+    def __init__(self, first_date, n_days):
+        self.first = pd.Timestamp(first_date).normalize()
+        self.dates = pd.date_range(self.first, periods=n_days, freq="D")
+        midnight = self.dates.to_numpy(dtype="datetime64[ns]")
+
+        # Defaults match the UI: the first day opens at 12:00, every day closes at
+        # 06:00 next day and the next one opens where it closed; weekends are peak.
+        self.end = midnight + np.timedelta64(30, "h")
+        self.start = np.concatenate([midnight[:1] + np.timedelta64(12, "h"), self.end[:-1]])
+        self.isPeak = np.asarray(self.dates.dayofweek >= 5)
+        self.matchLength = np.full(n_days, 120)
+        self.shiftLength = np.zeros(n_days, dtype=int)
+        self.shiftInterval = np.zeros(n_days, dtype=int)
+        self.apply_shift_rules()
+
+        self.weekdays = [d.day_name() for d in self.dates]
+        self.headers = [f"{d.day_name()}, {d.month_name()} {d.day}, {d.year}" for d in self.dates]
+        self.dateKeys = [f"{d:%Y-%m-%d} {d.day_name()[:3]}" for d in self.dates]
+
+    @classmethod
+    def from_kick_offs(cls, kick_offs):
+        """Calendar from the first to the last kick off date."""
+        kick_offs = pd.to_datetime(pd.Series(kick_offs)).dropna()
+        first, last = kick_offs.min().normalize(), kick_offs.max().normalize()
+        return cls(first, (last - first).days + 1)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def day_index(self, timestamps):
+        """Calendar day index of each timestamp (may fall outside 0..len-1)."""
+        values = np.asarray(timestamps, dtype="datetime64[ns]")
+        return ((values - np.datetime64(self.first, "ns")) // DAY).astype(int)
+
+    def window_mask(self, i, kick_offs):
+        """Kick offs inside day i's [start, end) window."""
+        kick_offs = np.asarray(kick_offs, dtype="datetime64[ns]")
+        return (kick_offs >= self.start[i]) & (kick_offs < self.end[i])
+
+    def set_peak_days(self, peak_days):
+        self.isPeak = np.isin(np.arange(len(self)), list(peak_days))
+
+    def apply_shift_rules(self, peak=(12, 12), nonPeak=(9, 15)):
+        """(shift length, shift interval) in hours for peak and non-peak days."""
+        self.shiftLength = np.where(self.isPeak, peak[0], nonPeak[0])
+        self.shiftInterval = np.where(self.isPeak, peak[1], nonPeak[1])
+
+    @property
+    def maximumAssignmentCount(self):
+        return np.where(self.isPeak, PEAK_MAXIMUM_ASSIGNMENTS, NON_PEAK_MAXIMUM_ASSIGNMENTS)
+
+    def day(self, i):
+        """Typed settings of day i as used by the assignment loop."""
+        return {
+            "index": i,
+            "date": self.headers[i],
+            "weekday": self.weekdays[i],
+            "matchDayStart": pd.Timestamp(self.start[i]),
+            "matchDayEnd": pd.Timestamp(self.end[i]),
+            "matchLength": int(self.matchLength[i]),
+            "isPeakDay": bool(self.isPeak[i]),
+            "shiftLength": int(self.shiftLength[i]),
+            "shiftInterval": int(self.shiftInterval[i]),
+            "maximumAssignmentCount": int(self.maximumAssignmentCount[i]),
+        }
+
+    def fingerprint(self) -> str:
+        h = hashlib.sha1(str(self.first).encode("utf-8"))
+        for values in (self.start, self.end, self.isPeak, self.matchLength, self.shiftLength, self.shiftInterval):
+            h.update(np.ascontiguousarray(values).tobytes())
+        return h.hexdigest()
+
+    # =========================
+    # JSON (service requests)
+    # =========================
+    def to_dict(self):
+        return {
+            "first": self.first.isoformat(),
+            "start": [pd.Timestamp(v).isoformat() for v in self.start],
+            "end": [pd.Timestamp(v).isoformat() for v in self.end],
+            "isPeak": self.isPeak.tolist(),
+            "matchLength": self.matchLength.tolist(),
+            "shiftLength": self.shiftLength.tolist(),
+            "shiftInterval": self.shiftInterval.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        calendar = cls(data["first"], len(data["start"]))
+        calendar.start = pd.to_datetime(data["start"]).to_numpy(dtype="datetime64[ns]")
+        calendar.end = pd.to_datetime(data["end"]).to_numpy(dtype="datetime64[ns]")
+        calendar.isPeak = np.asarray(data["isPeak"], dtype=bool)
+        calendar.matchLength = np.asarray(data["matchLength"], dtype=int)
+        calendar.shiftLength = np.asarray(data["shiftLength"], dtype=int)
+        calendar.shiftInterval = np.asarray(data["shiftInterval"], dtype=int)
+        return calendar
+
+
+class AvailabilityBits:
+    """
+    Per-analyst availability over the calendar days, packed 8 days to a byte.
+
+    Bits start from the weekday Y/N columns of the roster; date-specific
+    override rows (Analyst, Date, Available) then set or clear single days.
+    Overrides for unknown analysts or dates outside the calendar are ignored.
+    """
+
+    def __init__(self, df_availability, calendar, overrides=None):
+        weekly = np.column_stack([df_availability[day].to_numpy() == "Y" for day in WEEKDAYS])
+        days = weekly[:, calendar.dates.dayofweek]
+
+        if overrides is not None and len(overrides):
+            rows = pd.DataFrame({"Analyst": df_availability["Analyst"].to_numpy(),
+                                 "row": np.arange(len(df_availability))}).merge(overrides, on="Analyst")
+            cols = calendar.day_index(rows["Date"])
+            inside = (cols >= 0) & (cols < len(calendar))
+            days[rows["row"].to_numpy()[inside], cols[inside]] = rows["Available"].to_numpy()[inside] == "Y"
+
+        self.n_days = len(calendar)
+        self.bits = np.packbits(days, axis=1)
+
+    def on_day(self, i):
+        """Boolean roster mask of the analysts available on calendar day i."""
+        return ((self.bits[:, i >> 3] >> (7 - (i & 7))) & 1).astype(bool)
+
+    def pool_sizes(self):
+        """Available analysts per calendar day."""
+        return np.unpackbits(self.bits, axis=1, count=self.n_days).sum(axis=0)
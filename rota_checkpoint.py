@@ -0,0 +1,59 @@
+"""
+Per-day checkpoints for resumable runs.
+
+Each finished processing day is saved as one small pickle named by its
+chained day key (rota_engine.day_fingerprint): the previous day's key plus
+this day's settings, fixtures and the reference inputs. A rerun, a
+reconnect or a restarted process reuses every leading day whose key is
+unchanged, so changing a later day's settings recomputes from that day on.
+
+The folder is ROTA_CHECKPOINT_DIR (default .rota_checkpoints); files older
+than `max_age_days` are pruned when the store is opened.
+"""
+import os
+import pickle
+import time
+from pathlib import Path
+
+
+class CheckpointStore:
+
+    def __init__(self, root=None, max_age_days=14):
+        self.root = Path(root or os.environ.get("ROTA_CHECKPOINT_DIR", ".rota_checkpoints"))
+        self.restored = []
+        self.computed = []
+        self.prune(max_age_days)
+
+    def _path(self, key):
+        return self.root / f"{key}.pkl"
+
+    def begin_run(self):
+        """Reset the restored / computed day lists reported for the latest run."""
+        self.restored, self.computed = [], []
+
+    def load(self, key):
+        """Saved state of a day, or None (missing or unreadable files count as missing)."""
+        try:
+            with open(self._path(key), "rb") as fh:
+                return pickle.load(fh)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def save(self, key, state):
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so a process killed mid-write never leaves a half file behind.
+        tmp = self._path(key).with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as fh:
+            pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+
+    def prune(self, max_age_days):
+        if not self.root.is_dir():
+            return
+        cutoff = time.time() - max_age_days * 86400
+        for path in self.root.glob("*.pkl"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,726 @@
+"""
+Assignment engine for the T13 rota.
+
+Everything here is plain pandas so it can be driven from the Streamlit app,
+the local scheduling service (rota_service.py) or a script. Inputs are read
+and validated by rota_io.py.
+"""
+import copy
+import hashlib
+import heapq
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+from datetime import timedelta, time
+
+from rota_affinity import AFFINITY_LEVELS, SIDES, AffinityIndex, team_competitions
+from rota_calendar import AvailabilityBits
+from rota_io import frame_fingerprint
+
+PEAK_BINS = [-float("inf"), 40, 80, 140, 199.75, float("inf")]
+PEAK_LABELS = ["Platinum", "Gold", "Silver", "Bronze", "Ungraded"]
+
+
+# =========================
+# Reference data (resident between runs)
+# =========================
+def precompute_best_analyst(df_score: pd.DataFrame) -> pd.DataFrame:
+    # Expect df_score has columns: Analyst, Team, Score
+    df = df_score.copy()
+    df["Grade"] = pd.cut(df["Score"], bins=PEAK_BINS, labels=PEAK_LABELS)
+
+    summary = df.groupby(["Analyst", "Team"], as_index=False).agg(
+        match_count=("Score", "count"),
+        average_score=("Score", "mean"),
+    )
+
+    grade_counts = df.pivot_table(
+        index=["Analyst", "Team"],
+        columns="Grade",
+        values="Score",
+        aggfunc="count",
+        fill_value=0
+    ).reset_index()
+
+    final = summary.merge(grade_counts, on=["Analyst", "Team"], how="left")
+    final["Grade"] = pd.cut(final["average_score"], bins=PEAK_BINS, labels=PEAK_LABELS)
+    final["average_score"] = final["average_score"].round(2)
+    final["merge"] = (
+        final["Analyst"]
+        + " | "
+        + final["match_count"].astype(str)
+        + " | "
+        + final["average_score"].astype(str)
+    )
+    return final
+
+
+def build_team_history(analyst_summary: pd.DataFrame) -> pd.DataFrame:
+    """Analyst/team pairs with history (match_count, average_score), the team-candidate index."""
+    return analyst_summary[["Analyst", "Team", "match_count", "average_score"]].reset_index(drop=True)
+
+
+def prepare_availability(df_availability: pd.DataFrame, today=None) -> pd.DataFrame:
+    """Add 'Experience (Days)' from the department joining date."""
+    if today is None:
+        today = pd.Timestamp.today().normalize()
+    df_availability = df_availability.copy()
+
+    df_availability["DOJ in Department"] = pd.to_datetime(
+        df_availability["DOJ in Department"],
+        errors="coerce"
+    )
+
+    df_availability["Experience (Days)"] = (
+        today - df_availability["DOJ in Department"]
+    ).dt.days
+
+    # Optional cleanup
+    df_availability.loc[df_availability["Experience (Days)"] < 0, "Experience (Days)"] = None
+    return df_availability
+
+
+class ReferenceData:
+    """
+    Parsed inputs that change slowly between runs: availability roster and
+    its date overrides, QIndex, analyst/team summary and the team-candidate
+    history (rolled up by competition / tier per fixture plan, affinity_index()).
+
+    The derived frames are built on first use so loading a workbook stays
+    cheap until an assignment or export actually needs them; call warm()
+    to build them up front. With a `cache` (rota_cache.SharedCache) and the
+    content key of each sheet in `keys`, they are shared with every other
+    ReferenceData built from the same sheet.
+
+    `today` (default: the date it is built) is the date experience is counted
+    to; on() gives the same data as of another date.
+    """
+
+    def __init__(self, df_score, df_availability, df_qindex, fingerprint=None, today=None, df_overrides=None,
+                 cache=None, keys=None):
+        self.fingerprint = fingerprint
+        self.df_score = df_score
+        self.raw_availability = df_availability
+        self.df_qindex = df_qindex
+        self.df_overrides = df_overrides
+        self.today = pd.Timestamp(today if today is not None else pd.Timestamp.today()).normalize()
+        self.cache = cache
+        self.keys = keys or {}
+
+    def _derived(self, kind, sheet, build, *extra):
+        key = self.keys.get(sheet)
+        if self.cache is None or key is None:
+            return build()
+        return self.cache.get_or_build(kind, (key, *extra), build)
+
+    @cached_property
+    def df_availability(self):
+        return self._derived("availability", "Analyst Availability",
+                             lambda: prepare_availability(self.raw_availability, today=self.today), self.today)
+
+    @cached_property
+    def analyst_summary(self):
+        return self._derived("score summary", "Historical Score", lambda: precompute_best_analyst(self.df_score))
+
+    @cached_property
+    def team_history(self):
+        return self._derived("team index", "Historical Score", lambda: build_team_history(self.analyst_summary))
+
+    def affinity_index(self, plan):
+        """AffinityIndex of the team history over the competitions / tiers the plan's teams play in."""
+        competitionsKey = frame_fingerprint(team_competitions(plan.fixtures))
+        return self._derived("affinity index", "Historical Score",
+                             lambda: AffinityIndex(self.team_history, plan.fixtures), competitionsKey)
+
+    def on(self, today):
+        """This reference data as of `today`: availability (experience) is re-derived, the rest is shared."""
+        today = pd.Timestamp(today).normalize()
+        if today == self.today:
+            return self
+        other = copy.copy(self)
+        other.today = today
+        other.__dict__.pop("df_availability", None)
+        return other
+
+    def warm(self):
+        self.df_availability, self.team_history
+        return self
+
+
+# =========================
+# Shift helpers
+# =========================
+def calculate_shift_times(first_ko, shift_length_minutes):
+    """
+    first_ko: pd.Timestamp
+    shift_length_minutes: int
+    """
+    ko_time = first_ko.time()
+
+    # Night window: 23:00 → 05:00
+    if ko_time >= time(23, 0) or ko_time <= time(5, 0):
+        shift_start = (
+            first_ko.normalize() - timedelta(days=1)
+            if ko_time <= time(5, 0)
+            else first_ko.normalize()
+        ) + timedelta(hours=23)
+    else:
+        shift_start = first_ko - timedelta(minutes=90)
+
+    shift_end = shift_start + timedelta(hours=shift_length_minutes)
+
+    return shift_start, shift_end
+
+
+def adjust_start_time(current_df, previous_df, shiftInterval):
+    """
+    current_df: today's analyst availability dataframe
+    previous_df: yesterday's used analysts with Shift End
+    shiftInterval: hours between shifts
+    """
+
+    # Build quick lookup: Analyst -> yesterday shift end
+    prev_end_map = (
+        previous_df
+        .set_index("Analyst")["Shift End"]
+        .to_dict()
+    )
+
+    def compute_start(row):
+        analyst = row["Analyst"]
+        current_start = row["start time available"]
+
+        if analyst in prev_end_map:
+            min_start = prev_end_map[analyst] + pd.Timedelta(hours=shiftInterval)
+            return max(current_start, min_start)
+
+        return current_start
+
+    current_df["start time available"] = current_df.apply(compute_start, axis=1)
+
+    return current_df
+
+
+# =========================
+# Fixture plan (QIndex join + priority order, once per horizon)
+# =========================
+PRIORITY_ORDER = {'Tier': False, 'QIndex Target': False, 'Kick Off': True, 'Is_PMT': False}
+
+
+class FixturePlan:
+    """
+    Fixtures joined with QIndex once for the whole horizon.
+
+    missing_competitions falls out of the same join, and for_days() buckets the
+    joined rows into processing days in priority order so each day's loop is a
+    slice instead of its own merge + sort.
+    """
+
+    def __init__(self, fixtures, df_qindex):
+        joined = pd.merge(fixtures, df_qindex, on='Competition', how='left', indicator=True)
+        matched = (joined["_merge"] == "both").to_numpy()
+        self.missing_competitions = sorted(joined.loc[~matched, "Competition"].dropna().unique())
+        self.fixtures = joined[matched].drop(columns="_merge").reset_index(drop=True)
+
+    def for_days(self, calendar):
+        """
+        Return (ordered, bounds): rows of day i are ordered.iloc[bounds[i]:bounds[i + 1]].
+
+        A fixture lands in every calendar day whose [start, end) window holds
+        its kick off, and gets that day's 'Match Processing Date' label.
+        """
+        kickOff = self.fixtures["Kick Off"].to_numpy(dtype="datetime64[ns]")
+        dayIndex, rowIndex = np.nonzero((kickOff[None, :] >= calendar.start[:, None]) &
+                                        (kickOff[None, :] < calendar.end[:, None]))
+
+        ordered = self.fixtures.iloc[rowIndex].reset_index(drop=True)
+        ordered["Day Index"] = dayIndex
+        ordered["Match Processing Date"] = np.array(calendar.headers, dtype=object)[dayIndex]
+        ordered = ordered.sort_values(by=["Day Index", *PRIORITY_ORDER],
+                                      ascending=[True, *PRIORITY_ORDER.values()]).reset_index(drop=True)
+        bounds = np.searchsorted(ordered["Day Index"].to_numpy(), np.arange(len(calendar) + 1))
+        return ordered, bounds
+
+
+# =========================
+# Assignment loop
+# =========================
+def day_roster(df_availability, day, available):
+    """Analysts in the day's `available` mask with their opening availability window."""
+    currenDateAnalyst = df_availability.loc[available, ['Oracle ID','Batch','Analyst','Experience (Days)']].copy()
+    currenDateAnalyst['start time available'] = day["matchDayStart"]
+    currenDateAnalyst['End time available'] = day["matchDayEnd"] + timedelta(minutes=180)
+    currenDateAnalyst['Assignment Count'] = 0
+    currenDateAnalyst[['shift_start','shift_end']] = None
+    return currenDateAnalyst
+
+
+# Ordered selection policy. A slot goes to the best-ranked analyst of the first
+# rule that has anyone in the slot's window. "filter" (one name or a tuple that
+# must all hold) / "when" name boolean DayMatrix views (per analyst / per
+# fixture); "sort" names views, "-" for descending. "level" picks the affinity
+# level the history views read (rota_affinity, default team). Ties fall to the
+# day's tie-break order (roster order unless seeded).
+# Competition / tier history covers most of the roster, so those levels rank
+# the lightest workload first and keep the 365+ days rule for PMT matches.
+ROLLED_UP_SORT = ("count", "-matchCount", "averageScore")
+SELECTION_POLICY = (
+    {"rule": "team history", "filter": "hasHistory", "sort": ("-matchCount", "averageScore", "-count")},
+    {"rule": "competition history PMT", "level": "competition", "when": "pmt",
+     "filter": ("hasHistory", "experienced"), "sort": ROLLED_UP_SORT},
+    {"rule": "competition history non-PMT", "level": "competition", "when": "nonPmt", "filter": "hasHistory",
+     "sort": ROLLED_UP_SORT},
+    {"rule": "tier history PMT", "level": "tier", "when": "pmt", "filter": ("hasHistory", "experienced"),
+     "sort": ROLLED_UP_SORT},
+    {"rule": "tier history non-PMT", "level": "tier", "when": "nonPmt", "filter": "hasHistory", "sort": ROLLED_UP_SORT},
+    {"rule": "PMT experienced", "when": "pmt", "filter": "experienced", "sort": ("count", "-experience")},
+    {"rule": "PMT inexperienced", "when": "pmt", "filter": "inexperienced", "sort": ("count", "-experience")},
+    {"rule": "non-PMT", "when": "nonPmt", "filter": "inexperienced", "sort": ("count", "-experience")},
+)
+
+
+class SelectionPolicy:
+    """
+    A selection policy compiled against one day's DayMatrix.
+
+    Rule membership only depends on static views (history, experience,
+    Is_PMT), so it is resolved once per day into an (analyst x fixture) rule
+    index per side. Ranking a slot is then one pass: mask by the window,
+    fill each candidate's sort keys from its rule, one lexsort with the rule
+    as primary key.
+
+    Rules ranked only on per-analyst keys (the workload / experience
+    fallbacks) are also kept as heaps of (sort keys, tie-break, row,
+    version). pick() takes a slot's head from the heap instead of sorting;
+    a count change pushes a fresh entry (rekey) and the old one goes stale.
+    """
+
+    def __init__(self, rules, matrix):
+        self.rules = rules
+        self.width = max(len(rule["sort"]) for rule in rules)
+        self.sort = [[(name.lstrip("-"), -1.0 if name.startswith("-") else 1.0) for name in rule["sort"]]
+                     for rule in rules]
+        self.ruleIndex = {}
+        shape = (len(matrix.analysts), len(matrix.kickOff))
+        self.levels = [rule.get("level", "team") for rule in rules]
+        self.filters = [rule["filter"] if isinstance(rule["filter"], tuple) else (rule["filter"],) for rule in rules]
+        for side in SIDES:
+            ruleIndex = np.full(shape, len(rules), dtype=np.int8)
+            for r in reversed(range(len(rules))):
+                member = np.broadcast_to(self.member(matrix, r, side), shape)
+                if "when" in rules[r]:
+                    member = member & matrix.view(rules[r]["when"], side, self.levels[r])
+                ruleIndex[member] = r
+            self.ruleIndex[side] = ruleIndex
+
+        self.version = np.zeros(shape[0], dtype=int)
+        self.members, self.heaps = {}, {}
+        for r, rule in enumerate(rules):
+            names = [*self.filters[r], *(name for name, _ in self.sort[r])]
+            if all(matrix.view(name, SIDES[0], self.levels[r]).shape[1] == 1 for name in names):
+                self.members[r] = self.member(matrix, r, SIDES[0])[:, 0]
+                self.heaps[r] = self._entries(matrix, r, np.flatnonzero(self.members[r]))
+                heapq.heapify(self.heaps[r])
+
+    def member(self, matrix, r, side):
+        """Analysts passing every filter of rule r (before its "when")."""
+        member = matrix.view(self.filters[r][0], side, self.levels[r])
+        for name in self.filters[r][1:]:
+            member = member & matrix.view(name, side, self.levels[r])
+        return member
+
+    def _entries(self, matrix, r, rows):
+        keys = [sign * matrix.view(name, SIDES[0], self.levels[r])[rows, 0] for name, sign in self.sort[r]]
+        return list(zip(*(k.tolist() for k in keys), matrix.tieBreak[rows].tolist(), rows.tolist(),
+                        self.version[rows].tolist()))
+
+    def rekey(self, matrix, a):
+        """Re-queue analyst row `a` in the rule heaps after its Assignment Count changed."""
+        self.version[a] += 1
+        for r, heap in self.heaps.items():
+            if not self.members[r][a]:
+                continue
+            heapq.heappush(heap, self._entries(matrix, r, np.array([a]))[0])
+            if len(heap) > 2 * len(matrix.analysts):
+                heap[:] = [entry for entry in heap if entry[-1] == self.version[entry[-2]]]
+                heapq.heapify(heap)
+
+    def pick(self, matrix, f, side, window):
+        """Best candidate row for one slot (rank()'s first), or None."""
+        rule = self.ruleIndex[side][:, f]
+        valid = window & (rule < len(self.rules))
+        if not valid.any():
+            return None
+        first = rule[valid].min()
+        heap = self.heaps.get(first)
+        if heap is None:
+            candidates, _ = self.rank(matrix, f, side, valid & (rule == first))
+            return candidates[0]
+
+        while heap[0][-1] != self.version[heap[0][-2]]:
+            heapq.heappop(heap)
+        # Best-first walk of the heap array, which is left as it is: entries that
+        # are stale or outside the window are skipped, their children still visited.
+        frontier = [(heap[0], 0)]
+        while frontier:
+            entry, i = heapq.heappop(frontier)
+            a = entry[-2]
+            if entry[-1] == self.version[a] and valid[a] and rule[a] == first:
+                return a
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return None
+
+    def rank(self, matrix, f, side, window):
+        """(candidate rows best first, their rule index) for one slot."""
+        rule = self.ruleIndex[side][:, f]
+        candidates = np.flatnonzero(window & (rule < len(self.rules)))
+        rule = rule[candidates]
+        keys = np.zeros((self.width, len(candidates)))
+        for r in np.unique(rule):
+            inRule = rule == r
+            for k, (name, sign) in enumerate(self.sort[r]):
+                view = matrix.view(name, side, self.levels[r])
+                keys[k, inRule] = sign * view[candidates[inRule], f if view.shape[1] > 1 else 0]
+        # np.lexsort: last key is the primary one
+        order = np.lexsort((matrix.tieBreak[candidates], *keys[::-1], rule))
+        return candidates[order], rule[order]
+
+
+class DayMatrix:
+    """
+    Analyst x fixture view of one processing day, as NumPy arrays.
+
+    Static bits are built once when the day starts: experience flags and the
+    home/away history at each affinity level (match_count, average_score;
+    0/NaN for none).
+    Only the availability window, assignment count and shift times change as
+    slots are filled, so ranking a slot is a few array operations.
+
+    seed: 0 breaks ranking ties by roster order; any other seed by a seeded
+    random permutation of the roster (see rota_multistart).
+    """
+
+    def __init__(self, roster, fixtures, affinity, day, seed=0):
+        self.roster = roster
+        self.day = day
+        self.seed = seed
+        self.analysts = roster["Analyst"].to_numpy()
+        self.tieBreak = np.arange(len(self.analysts))
+        if seed:
+            self.tieBreak = np.random.default_rng(seed).permutation(len(self.analysts))
+        experience = roster["Experience (Days)"].to_numpy(dtype=float)
+        self.experience = np.nan_to_num(experience, nan=-1)
+        self.experienced = experience >= 365
+        self.inexperienced = experience <= 365
+
+        self.kickOff = fixtures["Kick Off"].to_numpy(dtype="datetime64[ns]", copy=True)
+        self.matchEnd = self.kickOff + np.timedelta64(day["matchLength"], "m")
+        self.isPmt = fixtures["Is_PMT"].to_numpy()
+
+        self.history = self.history_matrices(fixtures, affinity)
+
+        self.start = roster["start time available"].to_numpy(dtype="datetime64[ns]", copy=True)
+        self.end = roster["End time available"].to_numpy(dtype="datetime64[ns]", copy=True)
+        self.count = np.zeros(len(self.analysts), dtype=int)
+        self.shiftStart = np.full(len(self.analysts), np.datetime64("NaT"), dtype="datetime64[ns]")
+        self.shiftEnd = self.shiftStart.copy()
+        self.compile_policy()
+
+    def compile_policy(self, rules=SELECTION_POLICY):
+        """(Re)compile the selection policy, e.g. after fixtures were added."""
+        self.policy = SelectionPolicy(rules, self)
+
+    @property
+    def matchCount(self):
+        return self.history["team"][0]
+
+    @property
+    def averageScore(self):
+        return self.history["team"][1]
+
+    def view(self, name, side, level="team"):
+        """Policy column by name, shaped (A, 1) per analyst, (1, F) per fixture or (A, F)."""
+        if name == "hasHistory":
+            return self.history[level][0][side] > 0
+        if name in ("matchCount", "averageScore"):
+            return self.history[level][name == "averageScore"][side]
+        if name in ("experienced", "inexperienced", "experience", "count"):
+            return getattr(self, name)[:, None]
+        if name in ("pmt", "nonPmt"):
+            return (self.isPmt == ("Yes" if name == "pmt" else "No"))[None, :]
+        raise KeyError(f"Unknown selection policy column '{name}'")
+
+    def history_matrices(self, fixtures, affinity):
+        """{level: (matchCount, averageScore)}, each per side an (analyst x fixture) matrix."""
+        history = {}
+        for level, column in AFFINITY_LEVELS.items():
+            matchCount, averageScore = {}, {}
+            for side in SIDES:
+                keys = fixtures[column or f"{side} Team"].to_numpy()
+                matchCount[side], averageScore[side] = affinity.matrices(level, self.analysts, keys)
+            history[level] = (matchCount, averageScore)
+        return history
+
+    def append_fixtures(self, fixtures, affinity):
+        """Add QIndex-joined fixtures (already in the day's window) and recompile the policy."""
+        for level, (matchCount, averageScore) in self.history_matrices(fixtures, affinity).items():
+            for side in SIDES:
+                self.history[level][0][side] = np.hstack([self.history[level][0][side], matchCount[side]])
+                self.history[level][1][side] = np.hstack([self.history[level][1][side], averageScore[side]])
+        kickOff = fixtures["Kick Off"].to_numpy(dtype="datetime64[ns]")
+        self.kickOff = np.append(self.kickOff, kickOff)
+        self.matchEnd = np.append(self.matchEnd, kickOff + np.timedelta64(self.day["matchLength"], "m"))
+        self.isPmt = np.append(self.isPmt, fixtures["Is_PMT"].to_numpy())
+        self.compile_policy()
+
+    def available(self, f):
+        """Dynamic check: free for the whole match and under the day's maximum."""
+        return ((self.start <= self.kickOff[f]) &
+                (self.end >= self.matchEnd[f]) &
+                (self.count < self.day["maximumAssignmentCount"]))
+
+    def ranked(self, f, side, window=None):
+        """
+        Candidate rows for one slot, best first, and the policy rule each came from.
+
+        window: analysts allowed to take it (default: available(f)).
+        """
+        if window is None:
+            window = self.available(f)
+        return self.policy.rank(self, f, side, window)
+
+    def pick(self, f, side, window=None):
+        """
+        Row of the analyst for one slot, or None.
+
+        Analysts with history for the team come first (most matches, then best
+        average score), then those with competition / tier history (fewest
+        assignments first; 365+ days experience for PMT matches). Otherwise fall
+        back on workload and experience: PMT matches try 365+ days experience
+        before everyone else, non-PMT matches only use analysts under 365 days.
+        See SELECTION_POLICY.
+        """
+        if window is None:
+            window = self.available(f)
+        return self.policy.pick(self, f, side, window)
+
+    def assign(self, a, f):
+        """
+        Update start/end availability for analyst row `a` after assignment.
+
+        start time  = match end time
+        end time    = first match start - 90 min + shift length (set on the first match)
+        """
+        if self.count[a] == 0:
+            shift_start, shift_end = calculate_shift_times(first_ko=pd.Timestamp(self.kickOff[f]),
+                                                           shift_length_minutes=self.day["shiftLength"])
+            self.shiftStart[a], self.shiftEnd[a] = shift_start, shift_end
+            self.end[a] = self.kickOff[f] - np.timedelta64(90, "m") + np.timedelta64(self.day["shiftLength"], "h")
+        self.start[a] = self.matchEnd[f]
+        self.count[a] += 1
+        self.policy.rekey(self, a)
+
+    def roster_frame(self):
+        """The day's roster with the availability and shift state written back."""
+        roster = self.roster.copy()
+        roster["start time available"] = self.start
+        roster["End time available"] = self.end
+        roster["Assignment Count"] = self.count
+        roster["shift_start"] = self.shiftStart
+        roster["shift_end"] = self.shiftEnd
+        return roster
+
+
+def assign_day(currentDayFixtures, currenDateAnalyst, affinity, day, trace=None, seed=0):
+    """
+    Greedy assignment of home/away analysts for one processing day.
+
+    currentDayFixtures must already be in priority order.
+    affinity: the run's rota_affinity.AffinityIndex (ReferenceData.affinity_index).
+    trace: optional rota_trace.DecisionTrace, given every slot's ranked candidates.
+    seed: tie-break seed for the DayMatrix (0 = roster order).
+    Returns the assignment rows and the day's DayMatrix.
+    """
+    matrix = DayMatrix(currenDateAnalyst, currentDayFixtures, affinity, day, seed=seed)
+    assignmentsList = []
+    for f, row in enumerate(currentDayFixtures.to_dict("records")):
+        picked = {}
+        for side in SIDES:
+            if trace is None:
+                a = matrix.pick(f, side)
+            else:
+                candidates, rules = matrix.ranked(f, side)
+                trace.record(matrix, day, row['Match ID'], f, side, candidates, rules)
+                a = candidates[0] if len(candidates) else None
+            if a is not None:
+                matrix.assign(a, f)
+            picked[side] = None if a is None else matrix.analysts[a]
+        assignmentsList.append(assignment_row(row, matrix.kickOff[f], matrix.matchEnd[f], picked))
+    return assignmentsList, matrix
+
+
+def assignment_row(row, kickOff, matchEnd, picked):
+    """One row of the Assignments output for fixture `row` and the picked {side: analyst}."""
+    return {
+        'Processing Date': row['Match Processing Date'],
+        'Tier': row['Tier'],
+        'Kick Off': row['Kick Off'],
+        'Match ID': row['Match ID'],
+        'Competition': row['Competition'],
+        'Home Team': row['Home Team'],
+        'Away Team': row['Away Team'],
+        'Home Analyst': picked["Home"],
+        'Away Analyst': picked["Away"],
+        'StartTime': pd.Timestamp(kickOff),
+        'EndTime': pd.Timestamp(matchEnd)
+    }
+
+
+FIXTURE_COLUMNS = ['Match ID', 'Competition', 'Home Team', 'Away Team', 'Kick Off']
+
+
+def run_fingerprint(fixtures, calendar, reference_fingerprint):
+    """Key of one run: the fixtures it sees, its calendar settings and the reference inputs."""
+    h = hashlib.sha1()
+    h.update(str(reference_fingerprint).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(fixtures[FIXTURE_COLUMNS], index=False).values.tobytes())
+    h.update(calendar.fingerprint().encode("utf-8"))
+    return h.hexdigest()
+
+
+SHIFT_COLUMNS = {"Analyst": "Analyst", "shift_start": "Shift Start", "shift_end": "Shift End",
+                 "Assignment Count": "Assignment Count"}
+
+
+# Bump when a change to the engine changes what a day produces, so old checkpoints are not reused.
+CHECKPOINT_VERSION = 3
+ROSTER_STATE = ["Analyst", "Assignment Count", "shift_start", "shift_end"]
+
+
+def day_fingerprint(previous, reference, day, fixtures, variant=""):
+    """
+    Chained key of one day's result: the previous day's key plus this day's own inputs.
+
+    variant: how the day is assigned, when not the single greedy pass (e.g. "starts=8").
+    """
+    h = hashlib.sha1(f"{CHECKPOINT_VERSION}|{previous}|{reference.fingerprint}|{reference.today}|{variant}"
+                     .encode("utf-8"))
+    h.update(repr(SELECTION_POLICY).encode("utf-8"))
+    h.update(repr(sorted((k, v) for k, v in day.items() if k != "index")).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(fixtures[FIXTURE_COLUMNS], index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def schedule_days(plan, reference, calendar, checkpoints=None, trace=None, multistart=None):
+    """
+    Run the assignment day by day, yielding (day, fixtures, matrix, assignments, roster).
+
+    roster holds each analyst's end-of-day ROSTER_STATE. Days before the
+    first / after the last day with fixtures are skipped. Each day's roster
+    opens no earlier than the previous day's shift end + that day's shift
+    interval.
+
+    checkpoints: optional rota_checkpoint.CheckpointStore. Days whose chained
+    key is already saved are restored instead of assigned (matrix is then None),
+    and newly assigned days are saved. With a trace, every day is assigned
+    (a restored day has no decisions to record) and still saved.
+
+    multistart: optional rota_multistart.MultiStart. Each day keeps the best of
+    its seeded passes, and the seed is recorded in multistart.seeds.
+    """
+    orderedFixtures, bounds = plan.for_days(calendar)
+    affinity = reference.affinity_index(plan)
+    availability = AvailabilityBits(reference.df_availability, calendar, reference.df_overrides)
+    activeDays = np.flatnonzero(np.diff(bounds))
+    if reference.fingerprint is None:
+        checkpoints = None
+
+    previousDayUsedAnalyst = None
+    # Competition / tier affinity depends on every fixture of the plan, so it heads the day chain.
+    dayKey = affinity.key
+    for i in range(activeDays[0], activeDays[-1] + 1) if len(activeDays) else ():
+        day = calendar.day(i)
+        currentDayFixtures = orderedFixtures.iloc[bounds[i]:bounds[i + 1]]
+        saved = None
+        if checkpoints is not None:
+            dayKey = day_fingerprint(dayKey, reference, day, currentDayFixtures,
+                                     variant=multistart.variant if multistart is not None else "")
+            if trace is None:
+                saved = checkpoints.load(dayKey)
+
+        if saved is not None:
+            matrix = None
+            assignmentsList, roster, seed = saved
+            checkpoints.restored.append(day["date"])
+        else:
+            currenDateAnalyst = day_roster(reference.df_availability, day, availability.on_day(i))
+
+            #Handling First Day assignment
+            if previousDayUsedAnalyst is not None:
+                currenDateAnalyst = adjust_start_time(current_df= currenDateAnalyst,
+                                                      previous_df= previousDayUsedAnalyst,
+                                                      shiftInterval= day["shiftInterval"])
+
+            seed = 0
+            if multistart is not None:
+                assignmentsList, matrix, seed = multistart.best(currentDayFixtures, currenDateAnalyst, affinity, day)
+            if multistart is None or trace is not None:
+                # A traced multi-start day replays its best seed here to record it.
+                assignmentsList, matrix = assign_day(currentDayFixtures, currenDateAnalyst, affinity, day,
+                                                     trace=trace, seed=seed)
+            roster = matrix.roster_frame()[ROSTER_STATE]
+            if checkpoints is not None:
+                checkpoints.save(dayKey, (assignmentsList, roster, seed))
+                checkpoints.computed.append(day["date"])
+
+        if multistart is not None:
+            multistart.seeds[day["date"]] = seed
+        yield day, currentDayFixtures, matrix, assignmentsList, roster
+
+        used = roster["Assignment Count"] > 0
+        previousDayUsedAnalyst = roster.loc[used, list(SHIFT_COLUMNS)].rename(columns=SHIFT_COLUMNS)
+
+
+def run_schedule(plan, reference, calendar, checkpoints=None, trace=None, multistart=None):
+    """
+    Run the assignment over consecutive processing days.
+
+    plan: FixturePlan of the uploaded fixtures
+    reference: ReferenceData
+    calendar: RotaCalendar with each day's window and shift settings
+    checkpoints: optional CheckpointStore to resume from / save finished days to
+    trace: optional rota_trace.DecisionTrace to record each slot's decision in
+    multistart: optional rota_multistart.MultiStart to keep the best of N seeded passes per day
+
+    Returns (assignments, shifts, non used analysts) DataFrames.
+    """
+    ovarallAssignmentsList = []
+    shiftFrames = []
+    nonUsedFrames = []
+    if checkpoints is not None:
+        checkpoints.begin_run()
+    if multistart is not None:
+        multistart.begin_run()
+    days = schedule_days(plan, reference, calendar, checkpoints, trace, multistart)
+    for day, _, _, assignmentsList, currenDateAnalyst in days:
+        ovarallAssignmentsList.extend(assignmentsList)
+
+        used = currenDateAnalyst["Assignment Count"] > 0
+        shiftFrames.append(currenDateAnalyst.loc[used, list(SHIFT_COLUMNS)].rename(columns=SHIFT_COLUMNS)
+                           .assign(Date=day["date"]))
+        nonUsedFrames.append(currenDateAnalyst.loc[~used, ["Analyst", "Assignment Count"]].assign(Date=day["date"]))
+
+    df_shifts = pd.DataFrame(columns=["Date", *SHIFT_COLUMNS.values()])
+    if shiftFrames:
+        df_shifts = pd.concat(shiftFrames, ignore_index=True)[df_shifts.columns]
+    df_NonUsedAnalyst = pd.DataFrame(columns=["Date", "Analyst", "Assignment Count"])
+    if nonUsedFrames:
+        df_NonUsedAnalyst = pd.concat(nonUsedFrames, ignore_index=True)[df_NonUsedAnalyst.columns]
+
+    overallMatchAssignment_df = pd.DataFrame(ovarallAssignmentsList)
+    if overallMatchAssignment_df.empty == False:
+        overallMatchAssignment_df = overallMatchAssignment_df.sort_values(by='Kick Off',ascending=True)
+    return overallMatchAssignment_df, df_shifts, df_NonUsedAnalyst
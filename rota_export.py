@@ -0,0 +1,197 @@
+"""
+Export artifacts for a finished run.
+
+Each artifact is serialised the first time its download is requested and
+kept for the rest of the run, so grabbing the CMS upload CSV never builds
+the full workbook (the analyst performance summary sheet is the big one).
+"""
+import threading
+from functools import cached_property
+from io import BytesIO
+
+import pandas as pd
+
+CSV_MIME = "text/csv"
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+PARQUET_MIME = "application/vnd.apache.parquet"
+
+# artifact -> (button label, file name, mime)
+ARTIFACTS = {
+    "cms_csv": ("CMS upload (CSV)", "cms_upload.csv", CSV_MIME),
+    "rota_csv": ("Rota (CSV)", "rota.csv", CSV_MIME),
+    "rota_xlsx": ("Rota (Excel)", "rota.xlsx", XLSX_MIME),
+    "workbook": ("Full workbook (Excel)", "assignment_export.xlsx", XLSX_MIME),
+    "trace_parquet": ("Decision trace (Parquet)", "decision_trace.parquet", PARQUET_MIME),
+}
+# only offered when the run was traced
+TRACE_ARTIFACTS = ["trace_parquet"]
+
+
+# =========================
+# Frames
+# =========================
+def build_cms_upload(assignments: pd.DataFrame) -> pd.DataFrame:
+    """Match ID + 'Home Analyst, Away Analyst' as pasted into the CMS."""
+    cms_df = assignments[['Match ID','Home Team','Away Team','Home Analyst','Away Analyst']].copy()
+    cms_df["Analyst Info"] = cms_df["Home Analyst"] + ", " + cms_df["Away Analyst"]
+    return cms_df[["Match ID", "Analyst Info"]]
+
+
+def build_rota(df_shifts: pd.DataFrame) -> pd.DataFrame:
+    """Analyst x shift date grid of shift start times."""
+    if df_shifts.empty:
+        return pd.DataFrame(columns=["Analyst"])
+    df = df_shifts.copy()
+
+    df["Shift Start"] = pd.to_datetime(df["Shift Start"])
+    df["Shift End"]   = pd.to_datetime(df["Shift End"])
+
+    df["Shift Date"] = df["Shift Start"].dt.strftime("%d-%b %a")
+    df["Shift Start Display"] = df["Shift Start"].dt.strftime("%I:%M %p").str.lstrip("0")
+    rota_df = (
+                df.pivot_table(
+                    index="Analyst",
+                    columns="Shift Date",
+                    values="Shift Start Display",
+                    aggfunc="first"   # safe: one shift per analyst per day
+                )
+                .reset_index()
+            )
+    date_cols = sorted(
+        rota_df.columns[1:],
+        key=lambda x: pd.to_datetime(x, format="%d-%b %a")
+    )
+    rota_df = rota_df[["Analyst"] + date_cols]
+    rota_df.columns.name = None
+    return rota_df
+
+
+# =========================
+# Serialisation
+# =========================
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def to_xlsx_bytes(sheets: dict) -> bytes:
+    """
+    Write {sheet name: DataFrame} to an xlsx with auto-fit columns.
+
+    A "Shifts" sheet gets its Analyst cells coloured by Assignment Count.
+    """
+    output = BytesIO()
+
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        workbook  = writer.book
+
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, index=False, sheet_name=sheet_name)
+
+        # ---------------- Formats ----------------
+        high_load_fmt = workbook.add_format({
+            "bg_color": "#FFC7CE",  # red
+            "font_color": "#9C0006"
+        })
+
+        medium_load_fmt = workbook.add_format({
+            "bg_color": "#FFE699",  # orange
+            "font_color": "#9C6500"
+        })
+
+        low_load_fmt = workbook.add_format({
+            "bg_color": "#C6EFCE",  # green
+            "font_color": "#006100"
+        })
+
+        # ---------------- Apply Analyst Colouring (df_shifts only) ----------------
+        df_shifts = sheets.get("Shifts")
+        if df_shifts is not None and not df_shifts.empty:
+            shifts_ws = writer.sheets["Shifts"]
+            load_formats = {3: high_load_fmt, 2: medium_load_fmt, 1: low_load_fmt}
+
+            analyst_col = df_shifts.columns.get_loc("Analyst")
+
+            for cell_row, (analyst, assignment_count) in enumerate(
+                    zip(df_shifts["Analyst"], df_shifts["Assignment Count"]), start=1):  # Excel row (skip header)
+                if assignment_count in load_formats:
+                    shifts_ws.write(cell_row, analyst_col, analyst, load_formats[assignment_count])
+
+        # ---------------- Auto-fit Columns for ALL Sheets ----------------
+        for sheet_name, df in sheets.items():
+            worksheet = writer.sheets[sheet_name]
+
+            for idx, col in enumerate(df.columns):
+                lengths = df[col].astype(str).str.len().fillna(0)
+                max_len = max(int(lengths.max()) if len(lengths) else 0, len(str(col))) + 2
+                worksheet.set_column(idx, idx, max_len)
+
+    return output.getvalue()
+
+
+# =========================
+# Per-run artifact cache
+# =========================
+class RunExports:
+    """
+    Lazily built downloads for one run.
+
+    build() is safe to call from the download callback thread; each artifact
+    is serialised at most once.
+    """
+
+    def __init__(self, assignments, shifts, non_used, reference, trace=None):
+        self.assignments = assignments
+        self.shifts = shifts
+        self.non_used = non_used
+        self.reference = reference
+        self.trace = trace
+        self._built = {}
+        self._lock = threading.Lock()
+
+    @cached_property
+    def rota(self):
+        return build_rota(self.shifts)
+
+    @cached_property
+    def cms_upload(self):
+        return build_cms_upload(self.assignments)
+
+    def artifacts(self) -> dict:
+        """The ARTIFACTS this run can offer."""
+        return {artifact: spec for artifact, spec in ARTIFACTS.items()
+                if self.trace is not None or artifact not in TRACE_ARTIFACTS}
+
+    def workbook_sheets(self):
+        sheets = {
+            "Assignments": self.assignments,
+            "Shifts": self.shifts,
+            "cms upload": self.cms_upload,
+            "Non Used Analyst": self.non_used,
+            "Analyst performance summary": self.reference.analyst_summary,
+            "Rota": self.rota,
+        }
+        if self.trace is not None:
+            sheets["Decision Trace"] = self.trace.to_frame()
+        return sheets
+
+    def _serialise(self, artifact):
+        if artifact == "cms_csv":
+            return to_csv_bytes(self.cms_upload)
+        if artifact == "rota_csv":
+            return to_csv_bytes(self.rota)
+        if artifact == "rota_xlsx":
+            return to_xlsx_bytes({"Rota": self.rota})
+        if artifact == "workbook":
+            return to_xlsx_bytes(self.workbook_sheets())
+        if artifact == "trace_parquet" and self.trace is not None:
+            return self.trace.to_parquet()
+        raise KeyError(f"Unknown export '{artifact}', expected one of {', '.join(ARTIFACTS)}")
+
+    def build(self, artifact) -> bytes:
+        with self._lock:
+            if artifact not in self._built:
+                self._built[artifact] = self._serialise(artifact)
+            return self._built[artifact]
+
+    def built_sizes(self) -> dict:
+        return {artifact: len(data) for artifact, data in self._built.items()}
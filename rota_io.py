@@ -0,0 +1,229 @@
+"""
+Reading and validating the rota inputs.
+
+Each input (Fixtures, Historical Score, Analyst Availability, QIndex) can
+come from its sheet in the input workbook or from its own CSV / Parquet
+file. Columns are checked and coerced up front so the engine can rely on
+the dtypes.
+"""
+import hashlib
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+INPUT_SHEETS = ["Fixtures", "Historical Score", "Analyst Availability", "QIndex"]
+REFERENCE_SHEETS = ["Historical Score", "Analyst Availability", "QIndex"]
+# May be left out; a missing one reads as an empty frame.
+OPTIONAL_SHEETS = ["Availability Overrides"]
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# column -> kind:
+#   "any"       column must exist
+#   "text"      non-empty value
+#   "number"    numeric
+#   "datetime"  parseable date/time ("optional_datetime" allows blanks)
+#   "flag"      Y / N, blank means N
+#   "yes_no"    Yes / No
+INPUT_SCHEMAS = {
+    "Fixtures": {
+        "Match ID": "text",
+        "Competition": "text",
+        "Home Team": "text",
+        "Away Team": "text",
+        "Kick Off": "datetime",
+    },
+    "Historical Score": {
+        "Analyst": "text",
+        "Team": "text",
+        "Score": "number",
+    },
+    "Analyst Availability": {
+        "Oracle ID": "any",
+        "Batch": "any",
+        "Analyst": "text",
+        "DOJ in Department": "optional_datetime",
+        **{day: "flag" for day in WEEKDAYS},
+    },
+    "QIndex": {
+        "Competition": "text",
+        "Tier": "number",
+        "QIndex Target": "number",
+        "Is_PMT": "yes_no",
+    },
+    # One row per analyst and date, on top of the weekday columns (Y = working, N = leave).
+    "Availability Overrides": {
+        "Analyst": "text",
+        "Date": "datetime",
+        "Available": "flag",
+    },
+}
+
+FLAG_VALUES = {"flag": ("Y", "N"), "yes_no": ("Yes", "No")}
+
+# sheet -> columns whose values may appear only once (the roster is looked up by analyst name)
+UNIQUE_COLUMNS = {"Analyst Availability": ("Analyst",)}
+
+FORMATS = {".xlsx": "xlsx", ".xlsm": "xlsx", ".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+
+class InputValidationError(ValueError):
+    """An input file is missing columns or has values of the wrong type."""
+
+    def __init__(self, sheet, problems):
+        self.sheet = sheet
+        self.problems = problems
+        super().__init__(f"{sheet}: " + "; ".join(problems))
+
+
+def content_fingerprint(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content key of a parsed input: the same columns and rows give the same key, whatever file they came in."""
+    h = hashlib.sha1("|".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def reference_fingerprint(sheet_fingerprints: dict) -> str:
+    """Combined key of the reference inputs (Historical Score, Availability, QIndex, overrides)."""
+    key = "|".join(f"{sheet}={sheet_fingerprints[sheet]}" for sheet in REFERENCE_SHEETS)
+    key += "".join(f"|{sheet}={sheet_fingerprints[sheet]}" for sheet in OPTIONAL_SHEETS
+                   if sheet_fingerprints.get(sheet))
+    return content_fingerprint(key.encode("utf-8"))
+
+
+def input_format(source, fmt=None) -> str:
+    """xlsx / csv / parquet from an explicit fmt or the file name."""
+    if fmt:
+        return FORMATS.get(f".{fmt.lower().lstrip('.')}", fmt)
+    name = source if isinstance(source, (str, Path)) else getattr(source, "name", "")
+    suffix = Path(str(name)).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Unsupported input file '{name}', expected .xlsx, .csv or .parquet")
+    return FORMATS[suffix]
+
+
+# =========================
+# Validation
+# =========================
+def validate_input(df: pd.DataFrame, sheet: str) -> pd.DataFrame:
+    """
+    Check required columns and coerce dtypes for one input.
+
+    Raises InputValidationError listing every problem found.
+    """
+    schema = INPUT_SCHEMAS[sheet]
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+
+    missing = [c for c in schema if c not in df.columns]
+    if missing:
+        raise InputValidationError(sheet, [f"missing column(s) {', '.join(missing)}"])
+
+    if sheet == "Fixtures":
+        df = df[df["Match ID"].notna() & (df["Match ID"].astype(str).str.strip() != "")]
+
+    problems = []
+    for col, kind in schema.items():
+        values = df[col]
+        present = values.notna()
+        if kind in ("datetime", "optional_datetime"):
+            # One unit whatever the reader gave (xlsx: us, pyarrow csv: s), so the content key matches.
+            parsed = pd.to_datetime(values, errors="coerce").dt.as_unit("ns")
+            bad = present & parsed.isna()
+            if kind == "datetime":
+                bad = bad | ~present
+            df[col] = parsed
+        elif kind == "number":
+            parsed = pd.to_numeric(values, errors="coerce")
+            bad = present & parsed.isna()
+            df[col] = parsed
+        elif kind in FLAG_VALUES:
+            cleaned = values.where(~present, values.astype(str).str.strip())
+            allowed = cleaned.isin(FLAG_VALUES[kind])
+            bad = ~allowed & (present if kind == "flag" else True)
+            df[col] = cleaned
+        elif kind == "text":
+            bad = ~present
+        else:
+            continue
+
+        if bad.any():
+            examples = ", ".join(repr(v) for v in values[bad].head(3).tolist())
+            expected = "/".join(FLAG_VALUES[kind]) if kind in FLAG_VALUES else kind.replace("optional_", "")
+            problems.append(f"{int(bad.sum())} row(s) in '{col}' are not {expected} (e.g. {examples})")
+
+    for col in UNIQUE_COLUMNS.get(sheet, ()):
+        repeated = df[col].notna() & df[col].duplicated(keep=False)
+        if repeated.any():
+            examples = ", ".join(repr(v) for v in df.loc[repeated, col].unique()[:3].tolist())
+            problems.append(f"{int(repeated.sum())} row(s) in '{col}' repeat a value (e.g. {examples})")
+
+    if problems:
+        raise InputValidationError(sheet, problems)
+    return df
+
+
+# =========================
+# Readers
+# =========================
+def _read_csv(source):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.read_csv(source)
+    return pd.read_csv(source, engine="pyarrow")
+
+
+def _read_parquet(source):
+    try:
+        return pd.read_parquet(source)
+    except ImportError as e:
+        raise ImportError("Reading Parquet inputs needs pyarrow (pip install pyarrow)") from e
+
+
+def empty_input(sheet: str) -> pd.DataFrame:
+    """An input with its schema columns and no rows."""
+    return validate_input(pd.DataFrame(columns=list(INPUT_SCHEMAS[sheet])), sheet)
+
+
+def read_input(source, sheet: str, fmt=None) -> pd.DataFrame:
+    """
+    Read and validate one input.
+
+    source: path, uploaded file or raw bytes (fmt is then required).
+    A workbook source is read from the sheet with the same name; an optional
+    sheet the workbook does not have reads as empty.
+    """
+    fmt = input_format(source, fmt)
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    if fmt == "xlsx":
+        book = pd.ExcelFile(source)
+        if sheet in OPTIONAL_SHEETS and sheet not in book.sheet_names:
+            return empty_input(sheet)
+        df = book.parse(sheet)
+    elif fmt == "csv":
+        df = _read_csv(source)
+    else:
+        df = _read_parquet(source)
+    return validate_input(df, sheet)
+
+
+def load_workbook(upload_file, sheets=None):
+    """
+    Read and validate input sheets from one workbook, in `sheets` order.
+
+    Defaults to the four input sheets followed by the optional ones.
+    """
+    if isinstance(upload_file, bytes):
+        upload_file = BytesIO(upload_file)
+    book = pd.ExcelFile(upload_file)
+    return tuple(
+        validate_input(book.parse(sheet), sheet) if sheet in book.sheet_names or sheet not in OPTIONAL_SHEETS
+        else empty_input(sheet)
+        for sheet in sheets or INPUT_SHEETS + OPTIONAL_SHEETS
+    )
@@ -0,0 +1,222 @@
+"""
+Live match-day mode.
+
+Starts from the planned assignment of one processing day and keeps that
+day's state in memory. Live changes (kick-off delay, analyst off sick, extra
+fixture) are applied to that state directly and return only the assignment
+rows they changed, instead of re-running the day.
+
+A time-ordered event heap (match start, match end / analyst release, shift
+end) tracks where the day is: advance(now) applies every event due by
+`now`. Matches that have started keep their analysts, except for a sick
+analyst's slots, which are re-picked for every match that has not ended.
+"""
+import heapq
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from rota_engine import SIDES, FixturePlan, assignment_row, schedule_days
+
+
+class LiveDay:
+    """
+    One processing day's assignment state, updated event by event.
+
+    Unlike the planning pass, a slot is open to any analyst who is free for
+    the whole match (no overlapping slot, inside their shift, under the
+    day's maximum), so a re-pick can use gaps earlier in the day. Once an
+    analyst's shift_end event has fired they are not re-picked.
+    """
+
+    def __init__(self, day, fixtures, matrix, assignments, df_qindex, affinity):
+        self.day = day
+        self.matrix = matrix
+        self.df_qindex = df_qindex
+        self.affinity = affinity
+        self.records = fixtures.to_dict("records")
+
+        analystRow = {analyst: a for a, analyst in reversed(list(enumerate(matrix.analysts)))}
+        self.slot = np.array([[analystRow.get(row[f"{side} Analyst"], -1) for side in SIDES]
+                              for row in assignments], dtype=int).reshape(-1, 2)
+        self.opening = matrix.roster["start time available"].to_numpy(dtype="datetime64[ns]")
+        self.closing = matrix.roster["End time available"].to_numpy(dtype="datetime64[ns]")
+        self.out = np.zeros(len(matrix.analysts), dtype=bool)
+        self.offShift = np.zeros(len(matrix.analysts), dtype=bool)
+        self.state = ["scheduled"] * len(self.records)
+        self.version = [0] * len(self.records)
+
+        self.now = None
+        self._events = []
+        self._seq = itertools.count()
+        for f in range(len(self.records)):
+            self._push_match(f)
+        for a in np.flatnonzero(matrix.count > 0):
+            self._push(matrix.shiftEnd[a], "shift_end", a, matrix.shiftEnd[a])
+
+    @classmethod
+    def start(cls, plan, reference, calendar, day_index):
+        """Plan the calendar up to `day_index` and keep that day live."""
+        for day, fixtures, matrix, assignments, _ in schedule_days(plan, reference, calendar):
+            if day["index"] == day_index:
+                return cls(day, fixtures, matrix, assignments, reference.df_qindex, reference.affinity_index(plan))
+        raise ValueError(f"No fixtures are planned on {calendar.headers[day_index]}")
+
+    # =========================
+    # Event heap
+    # =========================
+    def _push(self, when, kind, subject, tag):
+        heapq.heappush(self._events, (np.datetime64(when, "ns"), next(self._seq), kind, subject, tag))
+
+    def _push_match(self, f):
+        # Superseded start/end events are skipped lazily by their version tag.
+        self._push(self.matrix.kickOff[f], "match_start", f, self.version[f])
+        self._push(self.matrix.matchEnd[f], "match_end", f, self.version[f])
+
+    def advance(self, now):
+        """Apply every event due by `now`; returns them as {"Time", "Event", "Subject"} rows."""
+        self.now = np.datetime64(pd.Timestamp(now), "ns")
+        applied = []
+        while self._events and self._events[0][0] <= self.now:
+            when, _, kind, subject, tag = heapq.heappop(self._events)
+            if kind == "shift_end":
+                if self.matrix.shiftEnd[subject] != tag:
+                    continue
+                self.offShift[subject] = True
+                name = self.matrix.analysts[subject]
+            else:
+                if self.version[subject] != tag:
+                    continue
+                self.state[subject] = "live" if kind == "match_start" else "finished"
+                name = self.records[subject]["Match ID"]
+            applied.append({"Time": pd.Timestamp(when), "Event": kind, "Subject": name})
+        return applied
+
+    # =========================
+    # Slots
+    # =========================
+    def free(self, f):
+        """Analysts who can take a slot of fixture f right now."""
+        m = self.matrix
+        overlap = (self.slot >= 0) & ((m.kickOff < m.matchEnd[f]) & (m.matchEnd > m.kickOff[f]))[:, None]
+        busy = np.zeros(len(m.analysts), dtype=bool)
+        busy[self.slot[overlap]] = True
+        # m.end (first kick off - 90 min + shift length) can run past the shift end
+        # calculate_shift_times set, so the shift itself bounds the match too.
+        return (~busy & ~self.out & ~self.offShift &
+                (self.opening <= m.kickOff[f]) &
+                (np.isnat(m.shiftStart) | (m.shiftStart <= m.kickOff[f])) &
+                (np.isnat(m.shiftEnd) | (m.shiftEnd >= m.matchEnd[f])) &
+                (m.end >= m.matchEnd[f]) &
+                (m.count < self.day["maximumAssignmentCount"]))
+
+    def _assign(self, a, f, s):
+        m = self.matrix
+        first = m.count[a] == 0
+        m.assign(a, f)
+        self.slot[f, s] = a
+        if first:
+            self._push(m.shiftEnd[a], "shift_end", a, m.shiftEnd[a])
+
+    def _release(self, f, s):
+        m, a = self.matrix, self.slot[f, s]
+        self.slot[f, s] = -1
+        m.count[a] -= 1
+        m.policy.rekey(m, a)
+        if m.count[a] == 0:
+            # No matches left: back to the roster window, shift to be set by the next one.
+            m.shiftStart[a] = m.shiftEnd[a] = np.datetime64("NaT")
+            m.end[a] = self.closing[a]
+            self.offShift[a] = False
+
+    def _repick(self, f, s, keep=None):
+        """Fill slot (f, s), keeping analyst `keep` if they are still free for it."""
+        window = self.free(f)
+        a = keep if keep is not None and keep >= 0 and window[keep] else self.matrix.pick(f, SIDES[s], window=window)
+        if a is not None:
+            self._assign(a, f, s)
+
+    def row(self, f):
+        picked = {side: self.matrix.analysts[a] if a >= 0 else None for side, a in zip(SIDES, self.slot[f])}
+        return assignment_row(self.records[f], self.matrix.kickOff[f], self.matrix.matchEnd[f], picked)
+
+    def assignments(self) -> pd.DataFrame:
+        rows = [{**self.row(f), "Status": self.state[f]} for f in range(len(self.records))]
+        return pd.DataFrame(rows).sort_values(by="Kick Off", ascending=True) if rows else pd.DataFrame()
+
+    def _fixture(self, match_id):
+        for f, record in enumerate(self.records):
+            if str(record["Match ID"]) == str(match_id):
+                return f
+        raise KeyError(f"Match ID {match_id} is not on {self.day['date']}")
+
+    # =========================
+    # Live changes
+    # =========================
+    def delay_kick_off(self, match_id, minutes):
+        """
+        Move a match that has not finished by `minutes`.
+
+        Its analysts keep it if they are still free for the new times,
+        otherwise the slot is re-picked. Returns the changed rows.
+        """
+        f = self._fixture(match_id)
+        if self.state[f] == "finished":
+            raise ValueError(f"Match ID {match_id} has already finished")
+        m, delay = self.matrix, np.timedelta64(int(minutes), "m")
+        m.kickOff[f] += delay
+        m.matchEnd[f] += delay
+        self.records[f]["Kick Off"] = pd.Timestamp(m.kickOff[f])
+        self.version[f] += 1
+        self.state[f] = "scheduled"
+        self._push_match(f)
+        if self.now is not None and m.kickOff[f] <= self.now:
+            self.state[f] = "live"
+
+        for s in range(2):
+            a = self.slot[f, s]
+            if a >= 0:
+                self._release(f, s)
+            self._repick(f, s, keep=a)
+        return [self.row(f)]
+
+    def analyst_unavailable(self, analyst):
+        """Take an analyst out (sick, left early) and re-pick their slots of unfinished matches."""
+        hits = np.flatnonzero(self.matrix.analysts == analyst)
+        if not len(hits):
+            raise KeyError(f"{analyst} is not on the roster for {self.day['date']}")
+        self.out[hits] = True
+
+        changed = []
+        for f, s in zip(*np.nonzero(np.isin(self.slot, hits))):
+            if self.state[f] == "finished":
+                continue
+            self._release(f, s)
+            self._repick(f, s)
+            changed.append(f)
+        return [self.row(f) for f in dict.fromkeys(changed)]
+
+    def add_fixture(self, fixture: dict):
+        """Add a fixture (Match ID, Competition, Home Team, Away Team, Kick Off) and fill both slots."""
+        frame = pd.DataFrame([fixture])
+        frame["Kick Off"] = pd.to_datetime(frame["Kick Off"])
+        plan = FixturePlan(frame, self.df_qindex)
+        if plan.missing_competitions:
+            raise ValueError(f"Competition {', '.join(plan.missing_competitions)} is not in QIndex")
+        kickOff = frame["Kick Off"].iloc[0]
+        if not self.day["matchDayStart"] <= kickOff < self.day["matchDayEnd"]:
+            raise ValueError(f"Kick off {kickOff} is outside {self.day['date']}")
+
+        joined = plan.fixtures.assign(**{"Match Processing Date": self.day["date"]})
+        self.matrix.append_fixtures(joined, self.affinity)
+
+        f = len(self.records)
+        self.records.append(joined.to_dict("records")[0])
+        self.slot = np.vstack([self.slot, [-1, -1]])
+        self.state.append("scheduled")
+        self.version.append(0)
+        self._push_match(f)
+        for s in range(2):
+            self._repick(f, s)
+        return [self.row(f)]
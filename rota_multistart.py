@@ -0,0 +1,133 @@
+"""
+Multi-start greedy assignment.
+
+Ranking ties (equal Assignment Count, equal match_count, ...) are broken by
+roster order in the single greedy pass, and an unlucky order can leave slots
+empty that another order would fill. A MultiStart runs `starts` passes of
+each day in worker processes, each breaking ties with a different seeded
+permutation of the roster, and keeps the best one: most slots filled, then
+the most even workload. Seed 0 is the plain roster-order pass, so the result
+is never worse than the single pass. The seed kept for each day is recorded
+in `seeds` and reproduces it with rota_engine.assign_day(..., seed=seed).
+
+    with MultiStart(starts=8) as multistart:
+        run_schedule(plan, reference, calendar, multistart=multistart)
+    multistart.seeds    # {processing date: seed}
+"""
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+from rota_engine import SIDES, assign_day
+
+# The run's affinity index, set once per worker process by _init_worker().
+_SHARED = {}
+# Held while __main__ is swapped out to start workers (_bare_main).
+_MAIN_LOCK = threading.Lock()
+
+
+def start_score(assignmentsList, matrix) -> tuple:
+    """(slots filled, -spread of Assignment Count over the day's roster); higher is better."""
+    filled = sum(row[f"{side} Analyst"] is not None for row in assignmentsList for side in SIDES)
+    spread = float(np.std(matrix.count)) if len(matrix.count) else 0.0
+    return filled, -round(spread, 9)
+
+
+# =========================
+# Worker
+# =========================
+def _init_worker(affinity):
+    _SHARED["affinity"] = affinity
+
+
+@contextmanager
+def _bare_main():
+    """
+    Start worker processes with an empty __main__.
+
+    A forkserver worker re-runs the parent's main module if it has a __file__.
+    Under Streamlit that is app.py, UI and all, and the worker dies in it. The
+    passes only need this module.
+    """
+    with _MAIN_LOCK:
+        main = sys.modules["__main__"]
+        bare = sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            # A Streamlit rerun may have installed its own __main__ meanwhile; keep that one.
+            if sys.modules["__main__"] is bare:
+                sys.modules["__main__"] = main
+
+
+def run_start(task):
+    """One seeded pass of a day: (seed, score, assignment rows, DayMatrix)."""
+    fixtures, roster, day, seed = task
+    assignmentsList, matrix = assign_day(fixtures, roster, _SHARED["affinity"], day, seed=seed)
+    return seed, start_score(assignmentsList, matrix), assignmentsList, matrix
+
+
+# =========================
+# Runner
+# =========================
+class MultiStart:
+
+    def __init__(self, starts=8, workers=None):
+        self.starts = max(int(starts), 1)
+        self.workers = min(workers or os.cpu_count() or 1, self.starts)
+        self.seeds = {}
+        self.scores = {}
+        self._pool = None
+        self._poolAffinity = None
+
+    @property
+    def variant(self):
+        """Checkpoint key part: days assigned with a different number of starts differ."""
+        return f"starts={self.starts}"
+
+    def begin_run(self):
+        self.seeds, self.scores = {}, {}
+
+    def _executor(self, affinity):
+        # One pool per affinity index, so it is pickled to each worker once, not per pass.
+        # forkserver: forking the (threaded) Streamlit / service process can deadlock.
+        if self._poolAffinity is not affinity:
+            self.close()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("forkserver"),
+                                             initializer=_init_worker, initargs=(affinity,))
+            self._poolAffinity = affinity
+        return self._pool
+
+    def best(self, fixtures, roster, affinity, day):
+        """Best of the day's seeded passes: (assignment rows, DayMatrix, seed)."""
+        if self.starts == 1:
+            assignmentsList, matrix = assign_day(fixtures, roster, affinity, day)
+            results = [(0, start_score(assignmentsList, matrix), assignmentsList, matrix)]
+        else:
+            tasks = [(fixtures, roster, day, seed) for seed in range(self.starts)]
+            # Workers are started as tasks are submitted, i.e. inside map().
+            with _bare_main():
+                results = self._executor(affinity).map(run_start, tasks)
+            results = list(results)
+        # Equal scores keep the lowest seed, i.e. roster order when it is as good.
+        seed, score, assignmentsList, matrix = max(results, key=lambda result: (result[1], -result[0]))
+        self.scores[day["date"]] = score
+        return assignmentsList, matrix, seed
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+        self._pool = self._poolAffinity = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,349 @@
+"""
+Local scheduling service.
+
+Keeps the parsed reference data (availability roster, QIndex, analyst
+summary and team-candidate index) in memory so a request only carries the
+fixtures and day settings.
+
+    python rota_service.py --workbook input.xlsx --port 8765
+    python rota_service.py --workbook input.xlsx --score history.parquet
+
+Endpoints (JSON unless noted):
+    GET  /health     -> {"status", "fingerprint", "sheets", "analysts", "teams", "cache"}
+    POST /reference  -> body is the input .xlsx; replaces the resident data
+    POST /reference?sheet=QIndex&format=csv
+                     -> body is one reference input (xlsx, csv or parquet)
+    POST /schedule   -> {"fixtures": [...], "calendar": RotaCalendar.to_dict(), "today", "sheets"}
+                        returns {"assignments", "shifts", "nonUsed", "restoredDays", "elapsed_ms"}
+    POST /live/start -> {"fixtures", "calendar", "day": day index, "today", "sheets"}; keeps that day live
+                        (rota_live.LiveDay) and returns its {"assignments"}
+    POST /live/event -> {"type": "advance", "now"} | {"type": "delay", "matchId", "minutes"}
+                        | {"type": "unavailable", "analyst"} | {"type": "fixture", "fixture"}
+                        returns {"changed", "events", "elapsed_ms"}
+
+"today" (optional, default the service's current date) is the date analyst
+experience is counted to, so a service left running does not keep the date it
+was started on. "sheets" (optional) is the {sheet: content key} the caller
+expects the resident reference inputs to be; on any difference (another
+session pushed its workbook in between) the request gets a 409 with the
+resident "sheets" instead of a result computed from someone else's inputs.
+
+The Streamlit app uses this as a thin client when ROTA_SERVICE_URL is set.
+"""
+import argparse
+import json
+import threading
+import time
+import traceback
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+
+from rota_calendar import RotaCalendar
+from rota_checkpoint import CheckpointStore
+from rota_engine import FixturePlan, ReferenceData, run_schedule
+from rota_live import LiveDay
+from rota_cache import SHARED_CACHE
+from rota_io import (INPUT_SHEETS, OPTIONAL_SHEETS, REFERENCE_SHEETS, frame_fingerprint, input_format,
+                     load_workbook, read_input, reference_fingerprint)
+
+DATETIME_COLUMNS = ["Kick Off", "StartTime", "EndTime", "Shift Start", "Shift End"]
+
+
+# =========================
+# JSON helpers
+# =========================
+def frame_to_records(df: pd.DataFrame) -> list:
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def records_to_frame(records: list) -> pd.DataFrame:
+    df = pd.DataFrame(records)
+    for col in DATETIME_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce").dt.tz_localize(None)
+    return df
+
+
+# =========================
+# Server
+# =========================
+class SchedulingState:
+    """
+    Resident reference inputs, one (content key, frame) per sheet.
+
+    ReferenceData is rebuilt and swapped atomically whenever a sheet changes;
+    its derived frames come from SHARED_CACHE, so only the changed sheet's
+    are rebuilt.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sheets = {}
+        self.reference = None
+        self.live = None
+
+    def load(self, data: bytes, sheet=None, fmt="xlsx"):
+        if sheet is None:
+            frames = dict(zip(INPUT_SHEETS + OPTIONAL_SHEETS, load_workbook(data)))
+            frames = {name: frames[name] for name in REFERENCE_SHEETS + OPTIONAL_SHEETS}
+        elif sheet in REFERENCE_SHEETS + OPTIONAL_SHEETS:
+            frames = {sheet: read_input(data, sheet, fmt=fmt)}
+        else:
+            raise ValueError(f"'{sheet}' is not a reference input "
+                             f"({', '.join(REFERENCE_SHEETS + OPTIONAL_SHEETS)})")
+
+        updates = {}
+        for name, df in frames.items():
+            # Same convention as the app: an empty optional sheet has no key.
+            fingerprint = frame_fingerprint(df) if len(df) or name not in OPTIONAL_SHEETS else None
+            updates[name] = (fingerprint, SHARED_CACHE.intern(name, fingerprint, df) if fingerprint else df)
+
+        with self.lock:
+            self.sheets.update(updates)
+            if all(name in self.sheets for name in REFERENCE_SHEETS):
+                fingerprints = {name: fingerprint for name, (fingerprint, _) in self.sheets.items()}
+                overrides = self.sheets.get(OPTIONAL_SHEETS[0], (None, None))[1]
+                self.reference = ReferenceData(*(self.sheets[name][1] for name in REFERENCE_SHEETS),
+                                               fingerprint=reference_fingerprint(fingerprints),
+                                               df_overrides=overrides,
+                                               cache=SHARED_CACHE, keys=fingerprints).warm()
+        return self.reference
+
+    def reference_on(self, today=None):
+        """The resident reference data as of `today` (default: now), or None if none is loaded."""
+        reference = self.reference
+        return reference.on(today or pd.Timestamp.today()) if reference is not None else None
+
+    def sheet_fingerprints(self):
+        return {name: fingerprint for name, (fingerprint, _) in self.sheets.items()}
+
+
+class SchedulingHandler(BaseHTTPRequestHandler):
+    state = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        reference = self.state.reference
+        self._send_json(200, {
+            "status": "ok",
+            "fingerprint": reference.fingerprint if reference else None,
+            "sheets": self.state.sheet_fingerprints(),
+            "analysts": len(reference.df_availability) if reference else 0,
+            "teams": reference.team_history["Team"].nunique() if reference else 0,
+            "cache": SHARED_CACHE.stats(),
+        })
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            if url.path == "/reference":
+                reference = self.state.load(self._read_body(), sheet=query.get("sheet"),
+                                            fmt=query.get("format", "xlsx"))
+                self._send_json(200, {
+                    "fingerprint": reference.fingerprint if reference else None,
+                    "sheets": self.state.sheet_fingerprints(),
+                })
+            elif url.path == "/schedule":
+                self._schedule(json.loads(self._read_body()))
+            elif url.path == "/live/start":
+                self._live_start(json.loads(self._read_body()))
+            elif url.path == "/live/event":
+                self._live_event(json.loads(self._read_body()))
+            else:
+                self._send_json(404, {"error": f"unknown path {url.path}"})
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            # Anything else is a bug, but the client still gets an answer instead of a dropped connection.
+            traceback.print_exc()
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def _reference(self, request):
+        """The resident reference for this request, or None once a 409 has been sent."""
+        reference = self.state.reference_on(request.get("today"))
+        if reference is None:
+            self._send_json(409, {"error": "no reference data loaded, POST /reference first"})
+            return None
+        # reference.keys are the sheet keys it was built from, swapped together with it.
+        expected = request.get("sheets")
+        if expected is not None and any(expected.get(sheet) != reference.keys.get(sheet)
+                                        for sheet in REFERENCE_SHEETS + OPTIONAL_SHEETS):
+            self._send_json(409, {"error": "resident reference inputs differ from the expected sheets",
+                                  "sheets": {sheet: reference.keys.get(sheet)
+                                             for sheet in REFERENCE_SHEETS + OPTIONAL_SHEETS}})
+            return None
+        return reference
+
+    def _schedule(self, request):
+        reference = self._reference(request)
+        if reference is None:
+            return
+        started = time.perf_counter()
+        plan = FixturePlan(records_to_frame(request["fixtures"]), reference.df_qindex)
+        checkpoints = CheckpointStore()
+        assignments, shifts, nonUsed = run_schedule(plan,
+                                                    reference,
+                                                    RotaCalendar.from_dict(request["calendar"]),
+                                                    checkpoints=checkpoints)
+        self._send_json(200, {
+            "fingerprint": reference.fingerprint,
+            "restoredDays": len(checkpoints.restored),
+            "assignments": frame_to_records(assignments),
+            "shifts": frame_to_records(shifts),
+            "nonUsed": frame_to_records(nonUsed),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+
+    def _live_start(self, request):
+        reference = self._reference(request)
+        if reference is None:
+            return
+        calendar = RotaCalendar.from_dict(request["calendar"])
+        day = int(request["day"])
+        if not 0 <= day < len(calendar):
+            raise ValueError(f"day {day} is outside the calendar (0 to {len(calendar) - 1})")
+        plan = FixturePlan(records_to_frame(request["fixtures"]), reference.df_qindex)
+        live = LiveDay.start(plan, reference, calendar, day)
+        with self.state.lock:
+            self.state.live = live
+        self._send_json(200, {"day": live.day["date"], "assignments": frame_to_records(live.assignments())})
+
+    def _live_event(self, event):
+        live = self.state.live
+        if live is None:
+            self._send_json(409, {"error": "no live day, POST /live/start first"})
+            return
+        started = time.perf_counter()
+        changed, events = [], []
+        with self.state.lock:
+            if event["type"] == "advance":
+                events = live.advance(event["now"])
+            elif event["type"] == "delay":
+                changed = live.delay_kick_off(event["matchId"], event["minutes"])
+            elif event["type"] == "unavailable":
+                changed = live.analyst_unavailable(event["analyst"])
+            elif event["type"] == "fixture":
+                changed = live.add_fixture(event["fixture"])
+            else:
+                raise ValueError(f"unknown event type '{event['type']}'")
+        self._send_json(200, {
+            "changed": frame_to_records(pd.DataFrame(changed)),
+            "events": frame_to_records(pd.DataFrame(events)),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8765, state=None):
+    handler = type("Handler", (SchedulingHandler,), {"state": state or SchedulingState()})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+# =========================
+# Client (used by app.py)
+# =========================
+class ReferenceMismatch(Exception):
+    """The service holds other reference inputs than the request expected; `sheets` are the resident keys."""
+
+    def __init__(self, message, sheets):
+        super().__init__(message)
+        self.sheets = sheets
+
+
+def _call(url, path, data=None, content_type="application/json", timeout=60):
+    request = urllib.request.Request(url.rstrip("/") + path, data=data,
+                                     headers={"Content-Type": content_type})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        if e.code != 409:
+            raise
+        body = json.loads(e.read() or b"{}")
+        if "sheets" not in body:
+            raise
+        raise ReferenceMismatch(body.get("error", "reference mismatch"), body["sheets"]) from None
+
+
+def service_health(url):
+    return _call(url, "/health")
+
+
+def push_reference(url, data: bytes, sheet=None, fmt="xlsx"):
+    """Send the whole workbook, or with `sheet` a single reference input."""
+    path = "/reference"
+    if sheet is not None:
+        path += "?" + urllib.parse.urlencode({"sheet": sheet, "format": fmt})
+    return _call(url, path, data=data, content_type="application/octet-stream")
+
+
+def request_schedule(url, fixtures, calendar, today=None, sheets=None):
+    """Assignments, shifts and non-used analysts; raises ReferenceMismatch if `sheets` are not resident."""
+    payload = json.dumps({"fixtures": frame_to_records(fixtures), "calendar": calendar.to_dict(),
+                          "today": str(pd.Timestamp(today).date()) if today is not None else None,
+                          "sheets": sheets})
+    result = _call(url, "/schedule", data=payload.encode("utf-8"))
+    return (records_to_frame(result["assignments"]),
+            records_to_frame(result["shifts"]),
+            records_to_frame(result["nonUsed"]))
+
+
+def start_live_day(url, fixtures, calendar, day_index, today=None, sheets=None):
+    payload = json.dumps({"fixtures": frame_to_records(fixtures), "calendar": calendar.to_dict(), "day": day_index,
+                          "today": str(pd.Timestamp(today).date()) if today is not None else None,
+                          "sheets": sheets})
+    return records_to_frame(_call(url, "/live/start", data=payload.encode("utf-8"))["assignments"])
+
+
+def send_live_event(url, event: dict):
+    """Apply one live event; returns (changed assignment rows, applied timeline events)."""
+    result = _call(url, "/live/event", data=json.dumps(event, default=str).encode("utf-8"))
+    return records_to_frame(result["changed"]), records_to_frame(result["events"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm-state rota scheduling service")
+    parser.add_argument("--workbook", help="input .xlsx to load at startup")
+    parser.add_argument("--score", help="Historical Score as .csv/.parquet/.xlsx (overrides the workbook sheet)")
+    parser.add_argument("--availability", help="Analyst Availability as .csv/.parquet/.xlsx")
+    parser.add_argument("--qindex", help="QIndex as .csv/.parquet/.xlsx")
+    parser.add_argument("--overrides", help="Availability Overrides as .csv/.parquet/.xlsx")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    state = SchedulingState()
+    if args.workbook:
+        state.load(Path(args.workbook).read_bytes())
+    for sheet, path in zip(REFERENCE_SHEETS + OPTIONAL_SHEETS,
+                           (args.score, args.availability, args.qindex, args.overrides)):
+        if path:
+            state.load(Path(path).read_bytes(), sheet=sheet, fmt=input_format(path))
+    server = make_server(args.host, args.port, state)
+    print(f"Rota service listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Opt-in decision trace for the assignment loop.
+
+For every slot the engine fills, records the policy rule that decided it and
+the top-k ranked candidates with the keys they were ranked on, as they were
+at that moment. Rows go into preallocated columns used as a ring buffer, so
+memory is fixed at `capacity` rows; when it wraps, the oldest slots are
+dropped. With no trace passed, the engine does no tracing work at all.
+
+    trace = DecisionTrace(top_k=5)
+    run_schedule(plan, reference, calendar, trace=trace)
+    trace.to_frame()       # one row per (slot, ranked candidate)
+    trace.to_parquet()
+"""
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+NO_CANDIDATE = "no candidate"
+
+# column -> dtype of the preallocated buffer
+TRACE_COLUMNS = {
+    "Slot": np.int64,
+    "Processing Date": object,
+    "Match ID": object,
+    "Side": object,
+    "Rule": np.int8,
+    "Rank": np.int16,
+    "Analyst": object,
+    "match_count": np.float64,
+    "average_score": np.float64,
+    "Assignment Count": np.float64,
+    "Experience (Days)": np.float64,
+}
+
+
+class DecisionTrace:
+
+    def __init__(self, top_k=5, capacity=100_000):
+        self.top_k = top_k
+        self.capacity = capacity
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in TRACE_COLUMNS.items()}
+        self.ruleNames = []
+        self.slots = 0
+        self._next = 0
+
+    def __len__(self):
+        return min(self._next, self.capacity)
+
+    def record(self, matrix, day, matchId, f, side, candidates, rules):
+        """One slot: the ranked `candidates` (DayMatrix rows) and their policy `rules`."""
+        if not self.ruleNames:
+            self.ruleNames = [rule["rule"] for rule in matrix.policy.rules]
+        top = candidates[:self.top_k]
+        n = max(len(top), 1)
+        at = (self._next + np.arange(n)) % self.capacity
+        self._next += n
+
+        c = self.columns
+        c["Slot"][at] = self.slots
+        c["Processing Date"][at] = day["date"]
+        c["Match ID"][at] = matchId
+        c["Side"][at] = side
+        if len(top):
+            c["Rule"][at] = rules[:n]
+            c["Rank"][at] = np.arange(1, n + 1)
+            c["Analyst"][at] = matrix.analysts[top]
+            # History keys at the level of each candidate's rule (team, competition or tier).
+            levels = np.array(matrix.policy.levels)[rules[:n]]
+            for level in np.unique(levels):
+                inLevel = levels == level
+                matchCount, averageScore = matrix.history[level]
+                c["match_count"][at[inLevel]] = matchCount[side][top[inLevel], f]
+                c["average_score"][at[inLevel]] = averageScore[side][top[inLevel], f]
+            c["Assignment Count"][at] = matrix.count[top]
+            c["Experience (Days)"][at] = np.where(matrix.experience[top] < 0, np.nan, matrix.experience[top])
+        else:
+            c["Rule"][at] = -1
+            c["Rank"][at] = 0
+            c["Analyst"][at] = None
+            for name in ("match_count", "average_score", "Assignment Count", "Experience (Days)"):
+                c[name][at] = np.nan
+        self.slots += 1
+
+    def to_frame(self) -> pd.DataFrame:
+        """Recorded rows, oldest first; Rank 1 is the analyst who got the slot."""
+        order = np.arange(len(self))
+        if self._next > self.capacity:
+            order = (order + self._next) % self.capacity
+        df = pd.DataFrame({name: values[order] for name, values in self.columns.items()})
+        # A slot split by the wrap point has lost its first rows; drop what is left of it.
+        if self._next > self.capacity and len(df):
+            df = df[df["Slot"] != df["Slot"].iloc[0]] if df["Rank"].iloc[0] > 1 else df
+        names = np.array(self.ruleNames + [NO_CANDIDATE], dtype=object)
+        df["Rule"] = names[df["Rule"].to_numpy(dtype=int)]
+        return df.reset_index(drop=True)
+
+    def to_parquet(self) -> bytes:
+        output = BytesIO()
+        self.to_frame().astype({"Match ID": str}).to_parquet(output, index=False)
+        return output.getvalue()
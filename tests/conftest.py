@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA = Path(__file__).resolve().parent / "data"
+sys.path.insert(0, str(ROOT))
+
+from rota_calendar import RotaCalendar  # noqa: E402
+from rota_engine import FixturePlan, ReferenceData  # noqa: E402
+from rota_io import load_workbook  # noqa: E402
+
+# The expected outputs in tests/data were produced with experience counted to this date.
+TODAY = pd.Timestamp("2026-10-19")
+
+
+@pytest.fixture(scope="session")
+def workbook():
+    """(fixtures, score, availability, qindex, overrides) of tests/data/small_input.xlsx."""
+    return load_workbook(DATA / "small_input.xlsx")
+
+
+@pytest.fixture
+def reference(workbook):
+    _, df_score, df_availability, df_qindex, df_overrides = workbook
+    return ReferenceData(df_score, df_availability, df_qindex, fingerprint="small_input", today=TODAY,
+                         df_overrides=df_overrides)
+
+
+@pytest.fixture
+def plan(workbook, reference):
+    return FixturePlan(workbook[0], reference.df_qindex)
+
+
+@pytest.fixture
+def calendar(workbook):
+    """The app's default day settings for the workbook's fixtures."""
+    calendar = RotaCalendar.from_kick_offs(workbook[0]["Kick Off"])
+    calendar.apply_shift_rules()
+    return calendar
+
+
+def slots(assignments):
+    """Processing Date, Match ID and analysts in a stable order, as strings (no analyst = "")."""
+    columns = ["Processing Date", "Match ID", "Home Analyst", "Away Analyst"]
+    df = assignments.sort_values(["Kick Off", "Match ID"], kind="stable")[columns] if "Kick Off" in assignments \
+        else assignments[columns]
+    return df.fillna("").astype(str).reset_index(drop=True)
+
+
+def shift_rows(shifts):
+    df = shifts.copy()
+    df["Shift Start"] = pd.to_datetime(df["Shift Start"]).dt.as_unit("ns")
+    df["Shift End"] = pd.to_datetime(df["Shift End"]).dt.as_unit("ns")
+    df["Assignment Count"] = df["Assignment Count"].astype(int)
+    df = df.assign(day=pd.to_datetime(df["Date"], format="%A, %B %d, %Y"))
+    return df.sort_values(["day", "Analyst"]).drop(columns="day").reset_index(drop=True)
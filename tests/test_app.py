@@ -0,0 +1,71 @@
+import pandas as pd
+
+from conftest import DATA, ROOT
+
+from streamlit.testing.v1 import AppTest
+
+
+def app_with_upload():
+    """app.py with its workbook uploader answered from ROTA_TEST_WORKBOOK."""
+    import io
+    import os
+
+    import streamlit as st
+
+    class Upload(io.BytesIO):
+        name = "input.xlsx"
+
+    if __name__ == "__main__":
+        # Only the script run itself gets the upload: a worker process re-running this
+        # file would run app.py with nothing uploaded, as it would under `streamlit run`.
+        workbook = os.environ["ROTA_TEST_WORKBOOK"]
+        st.file_uploader = lambda label, *args, key=None, **kwargs: (
+            None if key else Upload(open(workbook, "rb").read()))
+        st.session_state.run_assignment_clicked = True
+    app = os.environ["ROTA_TEST_APP"]
+    exec(compile(open(app).read(), app, "exec"), globals())
+
+
+def run_app(monkeypatch, tmp_path, workbook=DATA / "small_input.xlsx", **state):
+    monkeypatch.setenv("ROTA_TEST_WORKBOOK", str(workbook))
+    monkeypatch.setenv("ROTA_TEST_APP", str(ROOT / "app.py"))
+    monkeypatch.setenv("ROTA_CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    at = AppTest.from_function(app_with_upload, default_timeout=300)
+    for key, value in state.items():
+        at.session_state[key] = value
+    return at.run()
+
+
+def test_single_pass_run(monkeypatch, tmp_path):
+    at = run_app(monkeypatch, tmp_path)
+    assert not at.exception
+    assert len(at.session_state["run_exports"].assignments)
+
+
+def test_multi_start_run(monkeypatch, tmp_path):
+    at = run_app(monkeypatch, tmp_path, multistart_starts=3)
+    assert not at.exception
+    seeds = at.session_state["run_seeds"]
+    assert seeds and set(seeds.values()) <= {0, 1, 2}
+
+
+def test_peak_days_follow_dates_across_uploads(monkeypatch, tmp_path):
+    at = run_app(monkeypatch, tmp_path)
+    assert at.session_state["peakDays"] == ["2026-10-17", "2026-10-18"]
+    # Make a Friday peak as well, then upload the same fixtures three days later.
+    at.multiselect(key="peakDays").set_value(["2026-10-16", "2026-10-17", "2026-10-18"]).run()
+    assert not at.exception
+
+    sheets = pd.read_excel(DATA / "small_input.xlsx", sheet_name=None)
+    sheets["Fixtures"]["Kick Off"] = pd.to_datetime(sheets["Fixtures"]["Kick Off"]) + pd.Timedelta(days=3)
+    shifted = tmp_path / "shifted.xlsx"
+    with pd.ExcelWriter(shifted) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    monkeypatch.setenv("ROTA_TEST_WORKBOOK", str(shifted))
+    at.run()
+    assert not at.exception
+    # Oct 15-21 now: Fri-Sun keep the choice made for them, the new days take the weekday default.
+    assert at.session_state["peakDays"] == ["2026-10-16", "2026-10-17", "2026-10-18"]
+    assert at.session_state["nonPeakDays"] == ["2026-10-15", "2026-10-19", "2026-10-20", "2026-10-21"]
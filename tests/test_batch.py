@@ -0,0 +1,42 @@
+import shutil
+
+import pandas as pd
+
+from conftest import DATA
+from rota_batch import EXPORT_SUFFIX, SUMMARY_COLUMNS, find_workbooks, load_shared, run_batch
+
+
+def test_batch_runs_each_roster(tmp_path, workbook):
+    for name in ("tier_a", "tier_b"):
+        shutil.copy(DATA / "small_input.xlsx", tmp_path / f"{name}.xlsx")
+    workbooks = find_workbooks(tmp_path)
+    assert [p.stem for p in workbooks] == ["tier_a", "tier_b"]
+
+    summary = run_batch(workbooks, workers=2)
+    assert list(summary.columns) == SUMMARY_COLUMNS
+    assert (summary["Status"] == "ok").all()
+    # Two fixtures kick off before the first day's window: their slots count as unfilled.
+    assert (summary["Fixtures"] == len(workbook[0])).all()
+    assert (summary["Slots"] == 2 * len(workbook[0])).all()
+    for path, filled in zip(workbooks, summary["Filled"]):
+        export = pd.read_excel(path.with_name(path.stem + EXPORT_SUFFIX), sheet_name="Assignments")
+        assert len(export) == len(workbook[0]) - 2
+        assert export[["Home Analyst", "Away Analyst"]].notna().sum().sum() == filled
+    assert (summary["Coverage %"] == (100 * summary["Filled"] / summary["Slots"]).round(1)).all()
+    # Exports written next to the rosters are not picked up as rosters.
+    assert find_workbooks(tmp_path) == workbooks
+
+
+def test_manifest_and_shared_qindex_missing_a_competition(tmp_path, workbook):
+    shutil.copy(DATA / "small_input.xlsx", tmp_path / "roster.xlsx")
+    pd.DataFrame({"workbook": ["roster.xlsx"]}).to_csv(tmp_path / "manifest.csv", index=False)
+    qindex = workbook[3]
+    dropped = qindex["Competition"].iloc[0]
+    qindex[qindex["Competition"] != dropped].to_csv(tmp_path / "qindex.csv", index=False)
+
+    shared = load_shared({"QIndex": tmp_path / "qindex.csv"})
+    summary = run_batch(find_workbooks(tmp_path / "manifest.csv"), shared=shared, workers=1)
+    row = summary.iloc[0]
+    assert row["Status"] == f"ValueError: Competition {dropped} is not in QIndex"
+    assert row["Fixtures"] == len(workbook[0]) and row["Missing Competitions"] == 1
+    assert pd.isna(row["Export"]) and not (tmp_path / ("roster" + EXPORT_SUFFIX)).exists()
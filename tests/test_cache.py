@@ -0,0 +1,72 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from rota_cache import SharedCache
+from rota_engine import ReferenceData
+
+
+def test_cached_affinity_index_counts_its_frames(workbook, plan):
+    _, df_score, df_availability, df_qindex, _ = workbook
+    cache = SharedCache(2**30)
+    reference = ReferenceData(df_score, df_availability, df_qindex, cache=cache, keys={"Historical Score": "score"})
+    affinity = reference.affinity_index(plan)
+
+    (size,) = [size for (kind, _), (_, size) in cache._entries.items() if kind == "affinity index"]
+    frames = sum(int(frame.memory_usage(index=True, deep=True).sum()) for frame in affinity.levels.values())
+    assert frames <= size <= 2 * frames
+    assert reference.affinity_index(plan) is affinity
+
+
+def test_lru_eviction_by_size():
+    cache = SharedCache(max_bytes=2500)
+    block = lambda: np.zeros(100)    # 800 bytes
+    for key in "abc":
+        cache.get_or_build("block", key, block)
+    assert cache.bytes == 2400 and cache.evictions == 0
+
+    cache.get_or_build("block", "a", block)          # a is now the most recent
+    cache.get_or_build("block", "d", block)          # evicts b, the least recent
+    assert [key for (_, key) in cache._entries] == ["c", "a", "d"]
+    assert cache.evictions == 1 and cache.bytes == 2400
+
+    # Bigger than the whole cache: returned, not stored.
+    assert len(cache.get_or_build("block", "huge", lambda: np.zeros(1000))) == 1000
+    assert ("block", "huge") not in cache._entries
+
+
+def test_hit_miss_stats_per_kind():
+    cache = SharedCache(max_bytes=2**20)
+    frame = pd.DataFrame({"x": range(10)})
+    assert cache.intern("QIndex", "k1", frame) is frame
+    assert cache.intern("QIndex", "k1", frame.copy()) is frame
+    cache.get_or_build("team index", "k1", lambda: frame)
+    stats = cache.stats()
+    assert stats["kinds"] == {"QIndex": {"hits": 1, "misses": 1}, "team index": {"hits": 0, "misses": 1}}
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 2, 0.333)
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0 and cache.bytes == 0
+
+
+def test_concurrent_callers_build_once():
+    cache = SharedCache(max_bytes=2**20)
+    builds = []
+    started = threading.Event()
+
+    def build():
+        builds.append(1)
+        started.wait(1)
+        return np.arange(10)
+
+    values = []
+    threads = [threading.Thread(target=lambda: values.append(cache.get_or_build("summary", "k", build)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+    assert all(value is values[0] for value in values)
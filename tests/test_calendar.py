@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from rota_calendar import WEEKDAYS, AvailabilityBits, RotaCalendar
+
+
+def roster():
+    # Analyst A works Mondays only, analyst B every day but Monday.
+    return pd.DataFrame({"Analyst": ["A", "B"],
+                         **{day: ["Y" if day == "Monday" else "N", "N" if day == "Monday" else "Y"]
+                            for day in WEEKDAYS}})
+
+
+def test_weekday_columns_without_overrides():
+    calendar = RotaCalendar(pd.Timestamp("2026-10-19"), 14)    # a Monday
+    bits = AvailabilityBits(roster(), calendar)
+    mondays = calendar.dates.dayofweek == 0
+    for i in range(len(calendar)):
+        assert bits.on_day(i).tolist() == [mondays[i], not mondays[i]]
+    assert bits.pool_sizes().tolist() == [1] * 14
+
+
+def test_overrides_set_and_clear_single_days():
+    calendar = RotaCalendar(pd.Timestamp("2026-10-19"), 14)
+    overrides = pd.DataFrame({"Analyst": ["A", "B", "C", "A"],
+                              "Date": pd.to_datetime(["2026-10-21", "2026-10-26", "2026-10-21", "2027-01-04"]),
+                              "Available": ["Y", "N", "Y", "N"]})
+    bits = AvailabilityBits(roster(), calendar, overrides)
+
+    assert bits.on_day(2).tolist() == [True, True]       # A's day off made available
+    assert bits.on_day(7).tolist() == [True, False]      # B's Monday stays off; A's Monday unaffected
+    assert bits.on_day(9).tolist() == [False, True]      # the following Wednesday follows the weekday column
+    # Unknown analyst C and the date outside the calendar are ignored.
+    expected = np.array([[d == 0 for d in calendar.dates.dayofweek], [d != 0 for d in calendar.dates.dayofweek]])
+    expected[0, 2] = True
+    assert np.array_equal(np.column_stack([bits.on_day(i) for i in range(14)]), expected)
+
+
+def test_bits_cross_byte_boundaries():
+    calendar = RotaCalendar(pd.Timestamp("2026-10-19"), 20)
+    overrides = pd.DataFrame({"Analyst": ["A"] * 3, "Date": calendar.dates[[7, 8, 15]], "Available": ["N", "Y", "Y"]})
+    bits = AvailabilityBits(roster(), calendar, overrides)
+    assert [bits.on_day(i)[0] for i in (7, 8, 14, 15, 16)] == [False, True, True, True, False]
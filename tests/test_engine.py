@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA, shift_rows, slots
+from rota_checkpoint import CheckpointStore
+from rota_calendar import AvailabilityBits
+from rota_engine import SELECTION_POLICY, DayMatrix, assign_day, day_roster, run_schedule
+from rota_trace import DecisionTrace
+
+# The policy before the competition / tier affinity levels: the original loop's rules.
+BASELINE_POLICY = tuple(rule for rule in SELECTION_POLICY if "level" not in rule)
+
+
+def expected(name):
+    return pd.read_csv(DATA / name, dtype={"Match ID": str}, keep_default_na=False)
+
+
+def test_assignments_match_expected(reference, plan, calendar):
+    assignments, shifts, nonUsed = run_schedule(plan, reference, calendar)
+
+    pd.testing.assert_frame_equal(slots(assignments), expected("expected_assignments.csv").astype(str))
+    pd.testing.assert_frame_equal(shift_rows(shifts), shift_rows(expected("expected_shifts.csv")),
+                                  check_dtype=False)
+    for date, unused in nonUsed.groupby("Date"):
+        assert set(unused["Analyst"]).isdisjoint(shifts.loc[shifts["Date"] == date, "Analyst"])
+
+
+def test_baseline_policy_matches_original_loop(monkeypatch, reference, plan, calendar):
+    """Without the affinity levels the engine reproduces the original per-row pandas loop."""
+    compile_policy = DayMatrix.compile_policy
+    monkeypatch.setattr(DayMatrix, "compile_policy", lambda self, rules=BASELINE_POLICY: compile_policy(self, rules))
+    assignments, shifts, _ = run_schedule(plan, reference, calendar)
+
+    pd.testing.assert_frame_equal(slots(assignments), expected("baseline_assignments.csv").astype(str))
+    pd.testing.assert_frame_equal(shift_rows(shifts), shift_rows(expected("baseline_shifts.csv")),
+                                  check_dtype=False)
+
+
+def test_trace_does_not_change_the_result(reference, plan, calendar):
+    untraced, _, _ = run_schedule(plan, reference, calendar)
+    traced, _, _ = run_schedule(plan, reference, calendar, trace=DecisionTrace(top_k=3))
+
+    pd.testing.assert_frame_equal(slots(traced), slots(untraced))
+
+
+def test_checkpoint_resume_from_changed_day(tmp_path, reference, plan, calendar):
+    store = CheckpointStore(root=tmp_path)
+    first, _, _ = run_schedule(plan, reference, calendar, checkpoints=store)
+    assert store.restored == [] and len(store.computed) > 3
+
+    again, _, _ = run_schedule(plan, reference, calendar, checkpoints=store)
+    assert store.computed == [] and len(store.restored) > 3
+    pd.testing.assert_frame_equal(slots(again), slots(first))
+
+    # A later day's setting changes: the days before it are restored, it and the rest recomputed.
+    days = list(dict.fromkeys(first["Processing Date"]))
+    changed = calendar.headers.index(days[3])
+    calendar.matchLength[changed] = 150
+    resumed, resumedShifts, _ = run_schedule(plan, reference, calendar, checkpoints=store)
+    assert store.restored == days[:3]
+    assert store.computed == days[3:]
+
+    fresh, freshShifts, _ = run_schedule(plan, reference, calendar)
+    pd.testing.assert_frame_equal(slots(resumed), slots(fresh))
+    pd.testing.assert_frame_equal(shift_rows(resumedShifts), shift_rows(freshShifts))
+
+
+def test_checkpoints_follow_the_experience_date(tmp_path, reference, plan, calendar):
+    store = CheckpointStore(root=tmp_path)
+    run_schedule(plan, reference, calendar, checkpoints=store)
+    run_schedule(plan, reference.on(reference.today + pd.Timedelta(days=400)), calendar, checkpoints=store)
+    assert store.restored == []
+
+
+@pytest.mark.parametrize("seed", [0, 3])
+def test_seeded_pass_is_reproducible(reference, plan, calendar, seed):
+    orderedFixtures, bounds = plan.for_days(calendar)
+    i = int(np.flatnonzero(np.diff(bounds))[0])
+    day = calendar.day(i)
+    available = AvailabilityBits(reference.df_availability, calendar, reference.df_overrides).on_day(i)
+    roster = day_roster(reference.df_availability, day, available)
+    affinity = reference.affinity_index(plan)
+    first, _ = assign_day(orderedFixtures.iloc[bounds[i]:bounds[i + 1]], roster, affinity, day, seed=seed)
+    second, _ = assign_day(orderedFixtures.iloc[bounds[i]:bounds[i + 1]], roster, affinity, day, seed=seed)
+    assert first == second
+
+
+@pytest.mark.parametrize("seed", [0, 5])
+def test_pick_is_the_head_of_the_ranking(reference, plan, calendar, seed):
+    """The heap-backed pick of the fallback rules agrees with the full ranking on every slot."""
+    orderedFixtures, bounds = plan.for_days(calendar)
+    affinity = reference.affinity_index(plan)
+    availability = AvailabilityBits(reference.df_availability, calendar, reference.df_overrides)
+    for i in np.flatnonzero(np.diff(bounds)):
+        day = calendar.day(i)
+        matrix = DayMatrix(day_roster(reference.df_availability, day, availability.on_day(i)),
+                           orderedFixtures.iloc[bounds[i]:bounds[i + 1]], affinity, day, seed=seed)
+        assert sorted(matrix.policy.heaps) == [5, 6, 7]
+        for f in range(len(matrix.kickOff)):
+            for side in ("Home", "Away"):
+                candidates, _ = matrix.ranked(f, side)
+                a = matrix.pick(f, side)
+                assert a == (candidates[0] if len(candidates) else None)
+                if a is not None:
+                    matrix.assign(a, f)
+
+
+def test_rolled_up_levels_keep_the_pmt_experience_gate(reference, plan, calendar):
+    trace = DecisionTrace(top_k=1)
+    run_schedule(plan, reference, calendar, trace=trace)
+    decided = trace.to_frame()
+    decided = decided[decided["Rank"] == 1]
+
+    rolledUp = decided[decided["Rule"].str.startswith(("competition history", "tier history"))]
+    assert len(rolledUp)
+    pmt = rolledUp[rolledUp["Rule"].str.endswith(" PMT")]
+    assert (pmt["Experience (Days)"] >= 365).all()
+    # Unfamiliar teams still reach the workload / experience fallbacks.
+    assert decided["Rule"].isin(["PMT experienced", "PMT inexperienced", "non-PMT"]).any()
+
+
+def test_rolled_up_levels_prefer_the_lighter_workload(reference, plan, calendar):
+    trace = DecisionTrace(top_k=20)
+    run_schedule(plan, reference, calendar, trace=trace)
+    decided = trace.to_frame()
+    rolledUp = decided[decided["Rule"].str.startswith(("competition history", "tier history"))]
+    for _, slot in rolledUp.groupby("Slot"):
+        sameRule = slot[slot["Rule"] == slot["Rule"].iloc[0]]
+        assert sameRule["Assignment Count"].is_monotonic_increasing
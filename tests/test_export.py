@@ -0,0 +1,62 @@
+import threading
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from rota_engine import run_schedule
+from rota_export import ARTIFACTS, RunExports, build_rota
+from rota_trace import DecisionTrace
+
+
+@pytest.fixture
+def results(reference, plan, calendar):
+    return run_schedule(plan, reference, calendar)
+
+
+def test_artifacts_are_built_on_demand_once(monkeypatch, results, reference):
+    exports = RunExports(*results, reference=reference)
+    assert list(exports.artifacts()) == [a for a in ARTIFACTS if a != "trace_parquet"]
+
+    built = []
+    serialise = RunExports._serialise
+    monkeypatch.setattr(RunExports, "_serialise", lambda self, a: built.append(a) or serialise(self, a))
+    threads = [threading.Thread(target=exports.build, args=("cms_csv",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # The CMS upload alone never builds the workbook.
+    assert built == ["cms_csv"]
+    assert exports.build("cms_csv") is exports.build("cms_csv")
+
+    cms = pd.read_csv(BytesIO(exports.build("cms_csv")))
+    assert list(cms.columns) == ["Match ID", "Analyst Info"] and len(cms) == len(results[0])
+    rota = pd.read_csv(BytesIO(exports.build("rota_csv")))
+    assert set(rota["Analyst"]) == set(results[1]["Analyst"])
+
+    with pytest.raises(KeyError, match="Unknown export"):
+        exports.build("trace_parquet")
+
+
+def test_workbook_sheets(results, reference):
+    sheets = pd.read_excel(BytesIO(RunExports(*results, reference=reference).build("workbook")), sheet_name=None)
+    assert list(sheets) == ["Assignments", "Shifts", "cms upload", "Non Used Analyst",
+                            "Analyst performance summary", "Rota"]
+    assert len(sheets["Assignments"]) == len(results[0])
+    assert list(pd.read_excel(BytesIO(RunExports(*results, reference=reference).build("rota_xlsx")),
+                              sheet_name=None)) == ["Rota"]
+
+
+def test_traced_run_offers_the_trace(reference, plan, calendar):
+    trace = DecisionTrace(top_k=2)
+    exports = RunExports(*run_schedule(plan, reference, calendar, trace=trace), reference=reference, trace=trace)
+    assert list(exports.artifacts()) == list(ARTIFACTS)
+    decided = pd.read_parquet(BytesIO(exports.build("trace_parquet")))
+    assert len(decided) == len(trace.to_frame())
+    assert "Decision Trace" in pd.read_excel(BytesIO(exports.build("workbook")), sheet_name=None)
+
+
+def test_rota_without_shifts():
+    empty = build_rota(pd.DataFrame(columns=["Analyst", "Shift Start", "Shift End"]))
+    assert list(empty.columns) == ["Analyst"]
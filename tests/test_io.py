@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from rota_io import (INPUT_SCHEMAS, INPUT_SHEETS, OPTIONAL_SHEETS, WEEKDAYS, InputValidationError,
+                     frame_fingerprint, input_format, load_workbook, read_input, validate_input)
+
+
+def test_duplicate_analysts_are_rejected(workbook):
+    availability = workbook[2]
+    doubled = availability.iloc[[0, 1, 1, 2, 2]]
+    with pytest.raises(InputValidationError) as error:
+        validate_input(doubled, "Analyst Availability")
+    assert error.value.sheet == "Analyst Availability"
+    assert error.value.problems == [f"4 row(s) in 'Analyst' repeat a value "
+                                    f"(e.g. {availability['Analyst'].iloc[1]!r}, {availability['Analyst'].iloc[2]!r})"]
+    # The same names elsewhere (one row per analyst and team / date) are fine.
+    validate_input(workbook[1].iloc[[0, 0]], "Historical Score")
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_separate_inputs_read_like_the_workbook_sheets(tmp_path, workbook, fmt):
+    for sheet, frame in zip(INPUT_SHEETS + OPTIONAL_SHEETS, workbook):
+        path = tmp_path / f"{sheet}.{fmt}"
+        frame.to_csv(path, index=False) if fmt == "csv" else frame.to_parquet(path, index=False)
+        df = read_input(path, sheet)
+        pd.testing.assert_frame_equal(df, frame, check_dtype=False)
+        # Same content, same key: a sheet shares its cache entries whatever file it came in.
+        assert frame_fingerprint(df) == frame_fingerprint(frame)
+
+
+def test_bytes_need_a_format(workbook):
+    data = workbook[3].to_csv(index=False).encode("utf-8")
+    assert len(read_input(data, "QIndex", fmt="csv")) == len(workbook[3])
+    with pytest.raises(ValueError, match="Unsupported input file"):
+        read_input(data, "QIndex")
+    with pytest.raises(ValueError, match="expected .xlsx, .csv or .parquet"):
+        input_format("qindex.json")
+
+
+def test_optional_sheet_missing_from_the_workbook_reads_empty(tmp_path, workbook):
+    path = tmp_path / "no_overrides.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        for sheet, frame in zip(INPUT_SHEETS, workbook):
+            frame.to_excel(writer, sheet_name=sheet, index=False)
+    overrides = read_input(path, "Availability Overrides")
+    assert overrides.empty and list(overrides.columns) == list(INPUT_SCHEMAS["Availability Overrides"])
+    assert load_workbook(path)[4].empty
+
+
+def test_every_problem_is_reported():
+    fixtures = pd.DataFrame({"Match ID": ["1", "2", None], "Competition": ["A", None, "A"],
+                             "Home Team": ["H", "H", "H"], "Away Team": ["W", "W", "W"],
+                             "Kick Off": ["2026-10-19 15:00", "soon", "2026-10-19 17:00"]})
+    with pytest.raises(InputValidationError) as error:
+        validate_input(fixtures, "Fixtures")
+    # The row without a Match ID is dropped before checking.
+    competition, kickOff = error.value.problems
+    assert competition.startswith("1 row(s) in 'Competition' are not text")
+    assert kickOff == "1 row(s) in 'Kick Off' are not datetime (e.g. 'soon')"
+
+    with pytest.raises(InputValidationError, match="missing column"):
+        validate_input(fixtures.drop(columns="Kick Off"), "Fixtures")
+
+    qindex = pd.DataFrame({"Competition": ["A", "B"], "Tier": [1, "x"], "QIndex Target": [1, 2],
+                           "Is_PMT": [" Yes", "maybe"]})
+    with pytest.raises(InputValidationError) as error:
+        validate_input(qindex, "QIndex")
+    assert error.value.problems == ["1 row(s) in 'Tier' are not number (e.g. 'x')",
+                                    "1 row(s) in 'Is_PMT' are not Yes/No (e.g. 'maybe')"]
+
+    availability = validate_input(pd.DataFrame({"Oracle ID": [1], "Batch": ["B"], "Analyst": ["A"],
+                                                "DOJ in Department": [None],
+                                                **{day: [" Y" if day == "Monday" else None] for day in WEEKDAYS}}),
+                                  "Analyst Availability")
+    # Flags are stripped; blank flags and joining dates are allowed.
+    assert availability["Monday"].iloc[0] == "Y" and availability["DOJ in Department"].isna().all()
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rota_engine import run_schedule
+from rota_live import LiveDay
+
+
+def check_invariants(live):
+    m = live.matrix
+    for a in range(len(m.analysts)):
+        fs = np.flatnonzero((live.slot == a).any(axis=1))
+        assert (live.slot == a).sum() == m.count[a]
+        assert m.count[a] <= live.day["maximumAssignmentCount"]
+        spans = sorted((m.kickOff[f], m.matchEnd[f]) for f in fs)
+        assert all(earlier[1] <= later[0] for earlier, later in zip(spans, spans[1:]))
+    unfinished = [f for f, state in enumerate(live.state) if state != "finished"]
+    assert not np.isin(live.slot[unfinished], np.flatnonzero(live.out)).any()
+
+
+@pytest.fixture
+def live(reference, plan, calendar):
+    _, bounds = plan.for_days(calendar)
+    busiest = int(np.argmax(np.diff(bounds)))
+    return LiveDay.start(plan, reference, calendar, busiest)
+
+
+def test_starts_from_the_planned_day(live, reference, plan, calendar):
+    planned, _, _ = run_schedule(plan, reference, calendar)
+    planned = planned[planned["Processing Date"] == live.day["date"]]
+    columns = ["Match ID", "Home Analyst", "Away Analyst"]
+    assert live.assignments()[columns].reset_index(drop=True).equals(planned[columns].reset_index(drop=True))
+    check_invariants(live)
+
+
+def test_changes_keep_the_day_consistent(live):
+    live.advance(live.records[0]["Kick Off"] + pd.Timedelta(minutes=30))
+
+    later = [r["Match ID"] for f, r in enumerate(live.records) if live.state[f] == "scheduled"]
+    live.delay_kick_off(later[0], 45)
+    check_invariants(live)
+
+    busy = live.slot[live.slot >= 0]
+    sick = live.matrix.analysts[np.bincount(busy).argmax()]
+    changed = live.analyst_unavailable(sick)
+    assert all(sick not in (row["Home Analyst"], row["Away Analyst"]) for row in changed)
+    check_invariants(live)
+
+    record = live.records[-1]
+    live.add_fixture({"Match ID": "LIVE-1", "Competition": record["Competition"], "Home Team": record["Home Team"],
+                      "Away Team": record["Away Team"], "Kick Off": record["Kick Off"]})
+    check_invariants(live)
+
+    live.advance(live.day["matchDayEnd"] + pd.Timedelta(days=1))
+    assert set(live.state) == {"finished"}
+
+
+def test_off_shift_analysts_are_not_repicked(live):
+    m = live.matrix
+    working = np.flatnonzero(m.count > 0)
+    first = working[np.argmin(m.shiftEnd[working])]
+    live.advance(m.shiftEnd[first])
+    assert live.offShift[first]
+    for f in range(len(live.records)):
+        assert not live.free(f)[first]
@@ -0,0 +1,77 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from rota_calendar import AvailabilityBits
+from rota_engine import assign_day, day_roster
+from rota_multistart import MultiStart, start_score
+
+
+@pytest.fixture
+def busiest_day(reference, plan, calendar):
+    """(fixtures, roster, day) of the calendar day with the most fixtures."""
+    orderedFixtures, bounds = plan.for_days(calendar)
+    i = int(np.argmax(np.diff(bounds)))
+    day = calendar.day(i)
+    available = AvailabilityBits(reference.df_availability, calendar, reference.df_overrides).on_day(i)
+    return orderedFixtures.iloc[bounds[i]:bounds[i + 1]], day_roster(reference.df_availability, day, available), day
+
+
+def test_best_keeps_the_best_seeded_pass(reference, plan, busiest_day):
+    fixtures, roster, day = busiest_day
+    affinity = reference.affinity_index(plan)
+    with MultiStart(starts=4, workers=2) as multistart:
+        assignmentsList, matrix, seed = multistart.best(fixtures, roster, affinity, day)
+
+    passes = {s: assign_day(fixtures, roster, affinity, day, seed=s) for s in range(4)}
+    scores = {s: start_score(*result) for s, result in passes.items()}
+    assert seed == max(scores, key=lambda s: (scores[s], -s))
+    assert multistart.scores[day["date"]] == scores[seed]
+    assert assignmentsList == passes[seed][0]
+    assert np.array_equal(matrix.count, passes[seed][1].count)
+
+
+def test_single_start_runs_in_process(reference, plan, busiest_day):
+    fixtures, roster, day = busiest_day
+    affinity = reference.affinity_index(plan)
+    multistart = MultiStart(starts=1)
+    assignmentsList, _, seed = multistart.best(fixtures, roster, affinity, day)
+    assert seed == 0 and multistart._pool is None
+    assert assignmentsList == assign_day(fixtures, roster, affinity, day)[0]
+
+
+SCRIPT = """
+import sys
+sys.path[:0] = [{root!r}, {tests!r}]
+if __name__ == "__mp_main__":
+    open({marker!r}, "w").close()
+
+import pandas as pd
+from conftest import DATA, TODAY
+from rota_calendar import RotaCalendar
+from rota_engine import FixturePlan, ReferenceData, run_schedule
+from rota_io import load_workbook
+from rota_multistart import MultiStart
+
+if __name__ == "__main__":
+    fixtures, score, availability, qindex, overrides = load_workbook(DATA / "small_input.xlsx")
+    reference = ReferenceData(score, availability, qindex, today=TODAY, df_overrides=overrides)
+    calendar = RotaCalendar.from_kick_offs(fixtures["Kick Off"])
+    calendar.apply_shift_rules()
+    with MultiStart(starts=3, workers=2) as multistart:
+        run_schedule(FixturePlan(fixtures, qindex), reference, calendar, multistart=multistart)
+    print(len(multistart.seeds))
+"""
+
+
+def test_workers_do_not_rerun_the_main_script(tmp_path):
+    marker = tmp_path / "reran"
+    script = tmp_path / "main.py"
+    script.write_text(SCRIPT.format(root=str(ROOT), tests=str(ROOT / "tests"), marker=str(marker)))
+    done = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=300)
+    assert done.returncode == 0, done.stderr
+    assert int(done.stdout.split()[-1]) > 0
+    assert not marker.exists()
@@ -0,0 +1,87 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA, TODAY, slots
+from rota_engine import run_schedule
+from rota_service import (ReferenceMismatch, make_server, push_reference, request_schedule, send_live_event,
+                          service_health, start_live_day)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """URL of a scheduling service on a free localhost port, holding tests/data/small_input.xlsx."""
+    monkeypatch.setenv("ROTA_CHECKPOINT_DIR", str(tmp_path))
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    push_reference(url, (DATA / "small_input.xlsx").read_bytes())
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, path, payload):
+    """(status, JSON body) of a raw POST."""
+    request = urllib.request.Request(url + path, data=json.dumps(payload).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_schedule_matches_a_local_run(service, workbook, reference, plan, calendar):
+    health = service_health(service)
+    assert health["analysts"] == len(workbook[2])
+    assignments, shifts, _ = request_schedule(service, workbook[0], calendar, today=TODAY, sheets=health["sheets"])
+
+    local, localShifts, _ = run_schedule(plan, reference, calendar)
+    pd.testing.assert_frame_equal(slots(assignments), slots(local))
+    assert len(shifts) == len(localShifts)
+
+
+def test_schedule_refuses_other_reference_inputs(service, workbook, calendar):
+    sheets = service_health(service)["sheets"]
+    qindex = workbook[3].iloc[::-1]
+    push_reference(service, qindex.to_csv(index=False).encode("utf-8"), sheet="QIndex", fmt="csv")
+
+    with pytest.raises(ReferenceMismatch) as mismatch:
+        request_schedule(service, workbook[0], calendar, today=TODAY, sheets=sheets)
+    assert mismatch.value.sheets["QIndex"] != sheets["QIndex"]
+    assert mismatch.value.sheets["Historical Score"] == sheets["Historical Score"]
+    # Without an expectation the resident inputs are used.
+    request_schedule(service, workbook[0], calendar, today=TODAY)
+
+
+def test_live_day(service, workbook, plan, calendar):
+    _, bounds = plan.for_days(calendar)
+    day = int(np.argmax(np.diff(bounds)))
+    assignments = start_live_day(service, workbook[0], calendar, day, today=TODAY)
+    assert len(assignments) == bounds[day + 1] - bounds[day]
+
+    changed, _ = send_live_event(service, {"type": "delay", "matchId": assignments["Match ID"].iloc[-1],
+                                           "minutes": 30})
+    assert len(changed) == 1
+
+    status, body = post(service, "/live/event", {"type": "teleport"})
+    assert status == 400 and "teleport" in body["error"]
+
+
+def test_bad_requests_get_an_answer(service, workbook, calendar):
+    request = {"fixtures": json.loads(workbook[0].to_json(orient="records", date_format="iso")),
+               "calendar": calendar.to_dict(), "today": str(TODAY.date())}
+    status, body = post(service, "/live/start", {**request, "day": len(calendar) + 5})
+    assert status == 400 and "outside the calendar" in body["error"]
+
+    status, body = post(service, "/schedule", {**request, "calendar": []})
+    assert status == 500 and body["error"].startswith("TypeError")
+
+    status, body = post(service, "/nowhere", {})
+    assert status == 404
@@ -0,0 +1,41 @@
+import numpy as np
+
+from conftest import slots
+from rota_engine import run_schedule
+from rota_trace import NO_CANDIDATE, DecisionTrace
+
+
+def test_full_trace_ranks_the_assigned_analyst_first(reference, plan, calendar):
+    trace = DecisionTrace(top_k=4)
+    assignments, _, _ = run_schedule(plan, reference, calendar, trace=trace)
+    df = trace.to_frame()
+
+    assert trace.slots == 2 * len(assignments)
+    assert df["Slot"].nunique() == trace.slots
+    assert (df.groupby("Slot")["Rank"].max() <= 4).all()
+    assigned = slots(assignments).melt(id_vars=["Processing Date", "Match ID"], var_name="Side",
+                                       value_name="Analyst")
+    assigned["Side"] = assigned["Side"].str.split().str[0]
+    first = df[df["Rank"] <= 1].astype({"Match ID": str}).assign(Analyst=lambda d: d["Analyst"].fillna(""))
+    merged = first.merge(assigned, on=["Processing Date", "Match ID", "Side"], suffixes=("", " assigned"))
+    assert len(merged) == trace.slots
+    assert (merged["Analyst"] == merged["Analyst assigned"]).all()
+    assert ((merged["Analyst"] == "") == (merged["Rule"] == NO_CANDIDATE)).all()
+
+
+def test_ring_wraps_to_the_latest_slots(reference, plan, calendar):
+    full = DecisionTrace(top_k=3)
+    run_schedule(plan, reference, calendar, trace=full)
+    ring = DecisionTrace(top_k=3, capacity=25)
+    run_schedule(plan, reference, calendar, trace=ring)
+
+    assert full._next > ring.capacity and len(ring) == ring.capacity
+    df = ring.to_frame()
+    # Only whole slots are kept, and they are the last ones recorded.
+    assert len(df) <= ring.capacity
+    assert df.groupby("Slot")["Rank"].min().isin([0, 1]).all()
+    assert df["Slot"].iloc[-1] == ring.slots - 1
+    tail = full.to_frame()
+    tail = tail[tail["Slot"] >= df["Slot"].iloc[0]].reset_index(drop=True)
+    assert tail.equals(df)
+    assert np.array_equal(df["Slot"].to_numpy(), np.sort(df["Slot"].to_numpy()))